@@ -1,46 +1,215 @@
 import os
-from dotenv import load_dotenv, dotenv_values
+import re
+import stat
+import pickle
+import tempfile
 
-# Load environment variables from .env file
-load_dotenv()
+ENV_FILE = ".env"
+ENV_CACHE_FILE = ".env.cache.pkl"
+
+# KEY=value lines: optional "export", then a double-quoted, single-quoted or bare value
+_ENV_LINE_RE = re.compile(
+    r'^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=[ \t]*'
+    r'(?:"((?:[^"\\]|\\.)*)"|\'([^\']*)\'|([^\r\n]*))',
+    re.MULTILINE
+)
+_ENV_KEY_RE = re.compile(r'^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_.]*)[ \t]*=')
+_ENV_COMMENT_RE = re.compile(r'[ \t]+#.*')
+_ENV_ESCAPE_RE = re.compile(r'\\(.)')
+_ENV_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+
+def _parse_env_file(path):
+    """
+    Parse a .env file in a single read and a single regex pass
+
+    Handles the subset of dotenv syntax PosterBot's .env uses (comments,
+    export, quoted and bare values). Files using ${VAR} interpolation are
+    handed to python-dotenv so they keep its full semantics.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        chunks = []
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+
+    text = b"".join(chunks).decode("utf-8-sig")
+
+    if "${" in text:
+        from dotenv import dotenv_values
+        return dotenv_values(path)
+
+    values = {}
+    for key, double_quoted, single_quoted, bare in _ENV_LINE_RE.findall(text):
+        if double_quoted:
+            value = _ENV_ESCAPE_RE.sub(lambda m: _ENV_ESCAPES.get(m.group(1), m.group(1)), double_quoted)
+        elif single_quoted:
+            value = single_quoted
+        else:
+            value = _ENV_COMMENT_RE.sub("", bare).strip()
+        values[key] = value
+
+    return values
+
+
+def _load_env_file(path=ENV_FILE, cache_path=ENV_CACHE_FILE):
+    """
+    Parse the .env file, reusing a pickled copy while the file is unchanged
+
+    The cache is keyed by the file's mtime (ns), so editing .env (or
+    set_env_keys() rewriting it) invalidates it automatically.
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_mtime, values = pickle.load(f)
+        if cached_mtime == mtime:
+            return values
+    except Exception:
+        pass  # Missing or unreadable cache, re-parse below
+
+    values = _parse_env_file(path)
+
+    try:
+        # Same secrets as .env, so keep the cache owner-readable only
+        fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((mtime, dict(values)), f, protocol=5)
+    except OSError:
+        pass  # Cache is an optimization only
+
+    return values
+
+
+def _format_env_line(key, value):
+    """Format a KEY=value line the way python-dotenv's set_key() quotes it"""
+    if "'" not in value:
+        return f"{key}='{value}'"
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'{key}="{escaped}"'
+
+
+def set_env_keys(values, path=ENV_FILE):
+    """
+    Set several keys in the .env file with one atomic rewrite
+
+    Existing lines (comments, other keys, ordering) are preserved. The new
+    file is written to a temp file and swapped in with os.replace, so readers
+    never see a half-written .env or a mix of old and new values. Nothing is
+    written when every key already has its value.
+
+    Args:
+        values: Dict of key -> new value
+        path: Path to the .env file (default: .env)
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        lines, mode = [], 0o600
+
+    updated = set()
+    changed = False
+    for i, line in enumerate(lines):
+        match = _ENV_KEY_RE.match(line)
+        if match and match.group(1) in values:
+            key = match.group(1)
+            new_line = _format_env_line(key, values[key])
+            changed = changed or new_line != line
+            lines[i] = new_line
+            updated.add(key)
+
+    missing = [key for key in values if key not in updated]
+    if not changed and not missing:
+        return  # Already up to date; skip the rewrite and fsync
+
+    lines.extend(_format_env_line(key, values[key]) for key in missing)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".env.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Parse .env once; real environment variables take precedence over the file
+_env = _load_env_file()
+os.environ.update({k: v for k, v in _env.items() if k not in os.environ and v is not None})
+
+
+def _get(key, default=None):
+    """Get a setting from the environment, falling back to .env, then default"""
+    return os.environ.get(key) or _env.get(key) or default
 
-# Fallback: use dotenv_values for variables that don't load properly
-_env_values = dotenv_values(".env")
 
 class Config:
     """Configuration class for PosterBot"""
     
     # OpenAI API
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    OPENAI_API_KEY = _get("OPENAI_API_KEY")
 
     # Pexels API
-    PEXELS_API_KEY = os.getenv("PEXELS_API_KEY")
+    PEXELS_API_KEY = _get("PEXELS_API_KEY")
 
     # Email settings
-    EMAIL_SENDER = os.getenv("EMAIL_SENDER")
-    EMAIL_RECEIVER = os.getenv("EMAIL_RECEIVER")
-    EMAIL_APP_PASSWORD = os.getenv("EMAIL_APP_PASSWORD")
+    EMAIL_SENDER = _get("EMAIL_SENDER")
+    EMAIL_RECEIVER = _get("EMAIL_RECEIVER")
+    EMAIL_APP_PASSWORD = _get("EMAIL_APP_PASSWORD")
     
     # Video settings
-    VIDEO_WIDTH = int(os.getenv("VIDEO_WIDTH", "1280"))
-    VIDEO_HEIGHT = int(os.getenv("VIDEO_HEIGHT", "1280"))
-    VIDEO_FPS = int(os.getenv("VIDEO_FPS", "1"))
+    VIDEO_WIDTH = int(_get("VIDEO_WIDTH", "1280"))
+    VIDEO_HEIGHT = int(_get("VIDEO_HEIGHT", "1280"))
+    VIDEO_FPS = int(_get("VIDEO_FPS", "1"))
+    VIDEO_CODEC = _get("VIDEO_CODEC", "auto")  # "auto" (hardware H.264 if available), or an ffmpeg encoder name
     
     # Content settings
-    DEFAULT_VOICE = os.getenv("DEFAULT_VOICE", "random")
-    IMAGE_COUNT = int(os.getenv("IMAGE_COUNT", "10"))
-    IMAGE_SOURCE = os.getenv("IMAGE_SOURCE", "pexels")  # "flux-schnell", "flux-dev", "pexels", or "duckduckgo"
+    DEFAULT_VOICE = _get("DEFAULT_VOICE", "random")
+    IMAGE_COUNT = int(_get("IMAGE_COUNT", "10"))
+    IMAGE_SOURCE = _get("IMAGE_SOURCE", "pexels")  # "flux-schnell", "flux-dev", "pexels", or "duckduckgo"
+    JPEG_QUALITY = int(_get("JPEG_QUALITY", "85"))  # Quality for saved images (1-95)
+    # Generate narration in a background thread while images are collected
+    OVERLAP_AUDIO_AND_IMAGES = _get("OVERLAP_AUDIO_AND_IMAGES", "true").lower() in ("1", "true", "yes")
 
     # FLUX AI Image Generation settings
-    FLUX_MODEL = os.getenv("FLUX_MODEL", "schnell")  # "schnell" (fast) or "dev" (quality)
-    FLUX_QUANTIZE = int(os.getenv("FLUX_QUANTIZE", "8"))  # 4-8 bits (lower = faster, less memory)
+    FLUX_MODEL = _get("FLUX_MODEL", "schnell")  # "schnell" (fast) or "dev" (quality)
+    FLUX_QUANTIZE = int(_get("FLUX_QUANTIZE", "4"))  # 4-8 bits (lower = faster, less memory)
+    FLUX_STEPS = int(_get("FLUX_STEPS", "0"))  # Inference steps; 0 = model default (schnell 4, dev 20)
+    # Run one tiny generation after loading so the first real image isn't paying for kernel compilation
+    FLUX_WARMUP = _get("FLUX_WARMUP", "true").lower() in ("1", "true", "yes")
+    # Free MLX's cached buffers after every image; "auto" enables it on machines with 16GB RAM or less
+    FLUX_LOW_RAM = _get("FLUX_LOW_RAM", "auto").lower()
+    # Pre-quantized weights saved on first load, one folder per (model, quantize) pair
+    FLUX_QUANTIZED_CACHE_DIR = _get("FLUX_QUANTIZED_CACHE_DIR", os.path.join("models", "flux"))
+    # Keep the model loaded in a background server shared by every run (core/flux_server.py)
+    FLUX_SERVER = _get("FLUX_SERVER", "false").lower() in ("1", "true", "yes")
+    FLUX_SERVER_PORT = int(_get("FLUX_SERVER_PORT", "4030"))
 
     # TikTok API settings
-    TIKTOK_CLIENT_KEY = os.getenv("TIKTOK_CLIENT_KEY") or _env_values.get("TIKTOK_CLIENT_KEY")
-    TIKTOK_CLIENT_SECRET = os.getenv("TIKTOK_CLIENT_SECRET") or _env_values.get("TIKTOK_CLIENT_SECRET")
-    TIKTOK_ACCESS_TOKEN = os.getenv("TIKTOK_ACCESS_TOKEN") or _env_values.get("TIKTOK_ACCESS_TOKEN")
-    TIKTOK_REFRESH_TOKEN = os.getenv("TIKTOK_REFRESH_TOKEN") or _env_values.get("TIKTOK_REFRESH_TOKEN")
-    TIKTOK_REDIRECT_URI = os.getenv("TIKTOK_REDIRECT_URI") or _env_values.get("TIKTOK_REDIRECT_URI", "http://localhost:8080/callback")
+    TIKTOK_CLIENT_KEY = _get("TIKTOK_CLIENT_KEY")
+    TIKTOK_CLIENT_SECRET = _get("TIKTOK_CLIENT_SECRET")
+    TIKTOK_ACCESS_TOKEN = _get("TIKTOK_ACCESS_TOKEN")
+    TIKTOK_REFRESH_TOKEN = _get("TIKTOK_REFRESH_TOKEN")
+    TIKTOK_ACCESS_TOKEN_EXPIRES_AT = float(_get("TIKTOK_ACCESS_TOKEN_EXPIRES_AT", "0"))  # Unix time; 0 = unknown
+    TIKTOK_REDIRECT_URI = _get("TIKTOK_REDIRECT_URI", "http://localhost:8080/callback")
 
     # Directories
     OUTPUT_DIR = "output"
@@ -48,6 +217,12 @@ class Config:
     IMAGES_DIR = os.path.join(OUTPUT_DIR, "images")
     VIDEOS_DIR = os.path.join(OUTPUT_DIR, "videos")
     LOGS_DIR = "logs"
+    IDEA_CACHE_PATH = os.path.join(OUTPUT_DIR, "ideas.sqlite")  # Low-temperature idea cache
+    IMAGE_PROMPT_CACHE_PATH = os.path.join(OUTPUT_DIR, "image_prompts.sqlite")  # AI image prompts per script
+    SEARCH_CACHE_PATH = os.path.join(OUTPUT_DIR, "searches.sqlite")  # DuckDuckGo results cache
+    SEARCH_CACHE_TTL = 24 * 60 * 60  # Seconds before cached search results expire
+    TTS_CACHE_DIR = os.path.join(OUTPUT_DIR, "tts_cache")  # Synthesized sentences by content hash
+    TTS_CACHE_MAX_BYTES = int(_get("TTS_CACHE_MAX_MB", "500")) * 1024 * 1024
     
     # Voice options
     AVAILABLE_VOICES = ["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
@@ -72,6 +247,11 @@ class Config:
     @classmethod
     def create_directories(cls):
         """Create necessary directories if they don't exist"""
-        for directory in [cls.OUTPUT_DIR, cls.AUDIO_DIR, cls.IMAGES_DIR, 
-                         cls.VIDEOS_DIR, cls.LOGS_DIR]:
-            os.makedirs(directory, exist_ok=True)
+        # Parents come first, so a single mkdir per directory is enough
+        # (no repeated parent walks like os.makedirs)
+        for directory in [cls.OUTPUT_DIR, cls.LOGS_DIR, cls.AUDIO_DIR,
+                          cls.IMAGES_DIR, cls.VIDEOS_DIR]:
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                pass
@@ -2,6 +2,72 @@
 AI Prompt Generator for creating diverse image prompts
 """
 
+import re
+from functools import lru_cache
+from string import Formatter
+
+# Generation codes in parentheses, e.g. "(DC2)", "(A90)"
+_PAREN_RE = re.compile(r'\s*\([^)]*\)')
+# Runs of whitespace
+_WS_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template):
+    """
+    Pre-parse a shot template into a render(subject, base_style) function
+
+    The template is split into literal fragments and {subject}/{base_style}
+    fields once, so rendering is a single str.join instead of re-parsing the
+    format string on every call. Templates using anything beyond plain
+    {subject}/{base_style} fields fall back to str.format.
+    """
+    fields = {"subject": 0, "base_style": 1}
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if field not in fields or spec or conversion:
+            return lambda subject, base_style: template.format(subject=subject, base_style=base_style)
+        parts.append(fields[field])  # Field slots are ints, literals are str
+
+    fragments = tuple(parts)
+
+    def render(subject, base_style):
+        values = (subject, base_style)
+        return "".join([values[part] if type(part) is int else part for part in fragments])
+
+    return render
+
+
+class PromptInfo:
+    """
+    One rendered shot prompt, as held in the prompt cache
+
+    Slotted and immutable, so each cached entry is a small fixed record
+    rather than a dict. Callers get mutable dicts from to_dict().
+    """
+
+    __slots__ = ("prompt", "description", "name")
+
+    def __init__(self, prompt, description, name):
+        object.__setattr__(self, "prompt", prompt)
+        object.__setattr__(self, "description", description)
+        object.__setattr__(self, "name", name)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("PromptInfo is immutable")
+
+    def to_dict(self):
+        """Prompt dict with 'prompt', 'description', 'name' keys"""
+        return {"prompt": self.prompt, "description": self.description, "name": self.name}
+
+    def __repr__(self):
+        return f"PromptInfo(name={self.name!r}, prompt={self.prompt!r})"
+
+
 class AIPromptGenerator:
     """Generates diverse, cinematic prompts for AI image generation"""
 
@@ -23,36 +89,29 @@ class AIPromptGenerator:
         Returns:
             list: List of prompt dicts with 'prompt', 'description', 'name' keys
         """
-        if shot_templates is None:
-            raise ValueError("shot_templates is required. Legacy DEFAULT_CAR_TEMPLATES has been removed.")
-
-        prompts = []
+        return PromptBuilder(shot_templates, count=count, base_style=base_style).build(subject_name)
 
-        # Use default base style if not provided
-        if base_style is None:
-            base_style = AIPromptGenerator.DEFAULT_BASE_STYLE
-
-        # Clean the subject name (remove generation codes, etc.)
-        clean_name = AIPromptGenerator._clean_subject_name(subject_name)
-
-        # Generate prompts using templates
-        templates_to_use = shot_templates[:count]
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _build_prompts(clean_name, templates_key, base_style):
+        """
+        Format prompts for a cleaned subject (memoized)
 
-        for template_info in templates_to_use:
-            template = template_info["template"]
-            prompt = template.format(
-                subject=clean_name,
-                base_style=base_style
-            )
-            prompts.append({
-                "prompt": prompt,
-                "description": template_info["description"],
-                "name": template_info["name"]
-            })
+        Args:
+            clean_name: Cleaned subject name
+            templates_key: Tuple of (name, description, template) tuples
+            base_style: Base style string
 
-        return prompts
+        Returns:
+            tuple: PromptInfo records, one per template
+        """
+        return tuple(
+            PromptInfo(_compile_template(template)(clean_name, base_style), description, name)
+            for name, description, template in templates_key
+        )
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _clean_subject_name(subject_name):
         """
         Clean subject name while preserving important information
@@ -61,16 +120,58 @@ class AIPromptGenerator:
             "2020 Toyota Supra (A90)" -> "2020 Toyota Supra"
             "Phoenix Lights 1997" -> "Phoenix Lights 1997"
         """
-        import re
-
         # Remove generation codes in parentheses (e.g., "(DC2)", "(A90)")
-        cleaned = re.sub(r'\s*\([^)]*\)', '', subject_name)
+        cleaned = _PAREN_RE.sub('', subject_name)
 
         # Normalize en-dash to hyphen for year ranges
         cleaned = cleaned.replace('–', '-')
 
         # Clean up extra spaces
-        cleaned = ' '.join(cleaned.split())
+        return _WS_RE.sub(' ', cleaned).strip()
+
+
+class PromptBuilder:
+    """
+    Reusable prompt generator for one set of shot templates
+
+    Slicing and freezing the templates happens once in the constructor, so
+    generating prompts for many subjects with the same templates only pays
+    the per-subject work in build().
+    """
 
-        return cleaned.strip()
+    def __init__(self, shot_templates, count=10, base_style=None):
+        """
+        Args:
+            shot_templates: List of template dicts with 'name', 'description', 'template' keys (required)
+            count: Number of prompts to generate per subject (default: 10)
+            base_style: Base style string to append to prompts
+                       If None, uses AIPromptGenerator.DEFAULT_BASE_STYLE
+        """
+        if shot_templates is None:
+            raise ValueError("shot_templates is required. Legacy DEFAULT_CAR_TEMPLATES has been removed.")
+
+        # Use default base style if not provided
+        self.base_style = base_style if base_style is not None else AIPromptGenerator.DEFAULT_BASE_STYLE
+
+        # Freeze the templates we need into a hashable cache key
+        self._templates_key = tuple(
+            (t["name"], t["description"], t["template"])
+            for t in shot_templates[:count]
+        )
+
+    def build(self, subject_name):
+        """
+        Generate prompts for a subject
+
+        Args:
+            subject_name: Name of the subject (e.g., "2020 Toyota Supra (A90)")
+
+        Returns:
+            list: List of prompt dicts with 'prompt', 'description', 'name' keys
+        """
+        # Clean the subject name (remove generation codes, etc.)
+        clean_name = AIPromptGenerator._clean_subject_name(subject_name)
 
+        # Return fresh dicts so callers can modify prompts without touching the cache
+        cached = AIPromptGenerator._build_prompts(clean_name, self._templates_key, self.base_style)
+        return [prompt_info.to_dict() for prompt_info in cached]
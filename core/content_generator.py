@@ -1,28 +1,204 @@
-import json
-from openai import OpenAI
+import asyncio
+import hashlib
+import weakref
+try:
+    # orjson parses noticeably faster; fall back to the stdlib if it isn't installed
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 from config import Config
+from core.openai_client import get_client
+from core.disk_cache import SQLiteCache
+
+# The config's idea prompt is static, so it goes in the system message and the
+# varying part stays this short constant. An identical prefix on every call
+# lets OpenAI's automatic prompt caching reuse it.
+IDEA_USER_MESSAGE = "Generate one new video idea now."
+
+# Idea completions kept in process, in front of the on-disk cache
+IDEA_MEMO_SIZE = 128
 
 class ContentIdeaGenerator:
     """Generates content ideas for videos using OpenAI"""
 
+    # Async clients are tied to an event loop: {loop: {api_key: AsyncOpenAI}}
+    _async_clients = weakref.WeakKeyDictionary()
+
     def __init__(self, api_key=None, prompt_config=None):
         self.api_key = api_key or Config.OPENAI_API_KEY
-        self.client = OpenAI(api_key=self.api_key)
+        self._client = None  # Created on first API call
         self.prompt_config = prompt_config
 
         if not prompt_config:
             raise ValueError("ContentIdeaGenerator requires a PromptConfig object. Legacy topic-based mode has been removed.")
 
-    def generate_idea(self, prompt_config=None):
+    @property
+    def client(self):
+        """OpenAI client, created lazily so constructing the generator stays cheap"""
+        if self._client is None:
+            self._client = get_client(self.api_key)
+        return self._client
+
+    @classmethod
+    def _get_async_client(cls, api_key):
+        """Get the AsyncOpenAI client for an API key in the running event loop"""
+        loop_clients = cls._async_clients.setdefault(asyncio.get_running_loop(), {})
+        if api_key not in loop_clients:
+            from openai import AsyncOpenAI
+            loop_clients[api_key] = AsyncOpenAI(api_key=api_key)
+        return loop_clients[api_key]
+
+    def generate_idea(self, prompt_config=None, cache=None):
         """
         Generate a content idea for a video
 
         Args:
             prompt_config: PromptConfig object (overrides instance config if provided)
+            cache: Reuse/store results in the on-disk idea cache
+                   (default: only when temperature < 0.5)
+
+        Returns:
+            dict: {"subject": "...", "concept": "..."}
+        """
+        ideas = self.generate_ideas(count=1, prompt_config=prompt_config, cache=cache)
+        return ideas[0] if ideas else None
+
+    def generate_ideas(self, count=1, prompt_config=None, cache=None):
+        """
+        Generate several candidate content ideas in a single request
+
+        Uses the API's n parameter, so the prompt is sent (and billed) once
+        no matter how many ideas are requested. With response_format set to
+        json_object, every choice is its own complete JSON object, so each
+        one is parsed independently and a malformed choice is just dropped.
+
+        Args:
+            count: Number of ideas to generate (default: 1)
+            prompt_config: PromptConfig object (overrides instance config if provided)
+            cache: Reuse/store results in the on-disk idea cache
+                   (default: only when temperature < 0.5, since high
+                   temperatures are meant to give a new idea every run)
+
+        Returns:
+            list: List of {"subject": "...", "concept": "..."} dicts (empty on failure)
+        """
+        prompt, model, temperature, subject_key = self._idea_request_settings(prompt_config)
+
+        if cache is None:
+            cache = temperature < 0.5
+
+        contents = self._request_ideas(prompt, model, temperature, count, cache)
+        if contents is None:
+            return []
+
+        ideas = [self._parse_idea(content, subject_key) for content in contents]
+        return [idea for idea in ideas if idea is not None]
+
+    async def agenerate_idea(self, prompt_config=None, cache=None):
+        """
+        Async, streaming version of generate_idea()
+
+        Args:
+            prompt_config: PromptConfig object (overrides instance config if provided)
+            cache: Reuse/store results in the on-disk idea cache
+                   (default: only when temperature < 0.5)
 
         Returns:
             dict: {"subject": "...", "concept": "..."}
         """
+        ideas = await self.agenerate_ideas(count=1, prompt_config=prompt_config, cache=cache)
+        return ideas[0] if ideas else None
+
+    async def agenerate_ideas(self, count=1, prompt_config=None, cache=None):
+        """
+        Async, streaming version of generate_ideas()
+
+        The completion is streamed and each choice is parsed as soon as its
+        top-level JSON object closes, instead of after the whole response
+        (all n choices) has arrived.
+
+        Args:
+            count: Number of ideas to generate (default: 1)
+            prompt_config: PromptConfig object (overrides instance config if provided)
+            cache: Reuse/store results in the on-disk idea cache
+                   (default: only when temperature < 0.5)
+
+        Returns:
+            list: List of {"subject": "...", "concept": "..."} dicts (empty on failure)
+        """
+        prompt, model, temperature, subject_key = self._idea_request_settings(prompt_config)
+
+        if cache is None:
+            cache = temperature < 0.5
+
+        key = _idea_cache_key(prompt, model, temperature, count) if cache else None
+        if key is not None:
+            cached = _idea_cache.get(key)
+            if cached is not None:
+                print("✓ Using cached content idea")
+                ideas = [self._parse_idea(content, subject_key) for content in cached]
+                return [idea for idea in ideas if idea is not None]
+
+        buffers = {}
+        ideas = {}
+
+        try:
+            stream = await self._get_async_client(self.api_key).chat.completions.create(
+                stream=True,
+                **self._idea_request_kwargs(prompt, model, temperature, count)
+            )
+
+            async for chunk in stream:
+                for choice in chunk.choices:
+                    text = choice.delta.content
+                    if not text or choice.index in ideas:
+                        continue
+
+                    buffer = buffers.setdefault(choice.index, _JSONObjectBuffer())
+                    if buffer.feed(text):
+                        # Object is complete: parse now, while other choices keep streaming
+                        ideas[choice.index] = self._parse_idea(buffer.text, subject_key)
+
+        except Exception as e:
+            print(f"Failed to generate idea: {e}")
+            return []
+
+        # Any choice that never closed its object is still worth a parse attempt
+        for index, buffer in buffers.items():
+            if index not in ideas:
+                ideas[index] = self._parse_idea(buffer.text, subject_key)
+
+        if key is not None and buffers:
+            _idea_cache.put(key, [buffers[index].text for index in sorted(buffers)])
+
+        return [ideas[index] for index in sorted(ideas) if ideas[index] is not None]
+
+    async def agenerate_many(self, prompt_configs, cache=None):
+        """
+        Generate one idea per config concurrently
+
+        All requests are in flight at once over the shared async client, so
+        wall time is roughly that of the slowest call instead of the sum.
+        Usage: ideas = asyncio.run(generator.agenerate_many(configs))
+
+        Args:
+            prompt_configs: Iterable of PromptConfig objects (None uses the instance config)
+            cache: Passed through to agenerate_idea()
+
+        Returns:
+            list: One idea dict (or None on failure) per config, in order
+        """
+        return await asyncio.gather(
+            *(self.agenerate_idea(prompt_config=config, cache=cache) for config in prompt_configs)
+        )
+
+    def _idea_request_settings(self, prompt_config=None):
+        """
+        Resolve the prompt and model settings for an idea request
+
+        Returns:
+            tuple: (prompt, model, temperature, subject_key)
+        """
         # Use provided config or instance config
         config = prompt_config or self.prompt_config
 
@@ -30,34 +206,152 @@ class ContentIdeaGenerator:
             raise ValueError("PromptConfig is required. Legacy topic-based mode has been removed.")
 
         # Use PromptConfig
-        prompt = config.get_content_idea_prompt()
-        model = config.get_content_idea_model()
-        temperature = config.get_content_idea_temperature()
-        subject_key = config.get_subject_key()
+        return (
+            config.get_content_idea_prompt(),
+            config.get_content_idea_model(),
+            config.get_content_idea_temperature(),
+            config.get_subject_key(),
+        )
 
-        try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=1000,
-                top_p=0.95,
-                frequency_penalty=1.0,
-                presence_penalty=0.5,
-                n=1,
-                response_format={"type": "json_object"}
-            )
+    @staticmethod
+    def _idea_request_kwargs(prompt, model, temperature, count):
+        """Chat completion arguments shared by the sync and async paths"""
+        return dict(
+            model=model,
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": IDEA_USER_MESSAGE}
+            ],
+            temperature=temperature,
+            max_tokens=1000,
+            top_p=0.95,
+            frequency_penalty=1.0,
+            presence_penalty=0.5,
+            n=count,
+            response_format={"type": "json_object"}
+        )
 
+    @staticmethod
+    def _parse_idea(content, subject_key):
+        """Parse one completion into an idea dict (None if it isn't valid JSON)"""
+        try:
             # Parse the JSON output
-            idea = json.loads(response.choices[0].message.content)
+            idea = json_loads(content)
+        except Exception as e:
+            print(f"Failed to parse idea: {e}")
+            return None
+
+        # Normalize the keys to match our expected format
+        # The config tells us which key contains the subject
+        if subject_key != "subject" and subject_key in idea:
+            # Rebuild rather than pop + re-insert; keeps the key's position
+            idea = {"subject" if k == subject_key else k: v for k, v in idea.items()}
+
+        return idea
 
-            # Normalize the keys to match our expected format
-            # The config tells us which key contains the subject
-            if subject_key in idea and subject_key != "subject":
-                idea["subject"] = idea.pop(subject_key)
+    def _request_ideas(self, prompt, model, temperature, count, cache=False):
+        """
+        Call OpenAI for idea completions, optionally through the caches
 
-            return idea
+        With cache enabled, an in-process LRU is checked first, then the
+        on-disk cache, and only then the API.
 
+        Returns:
+            list: Raw JSON strings, one per choice (None on failure)
+        """
+        try:
+            if cache:
+                return list(_request_ideas_cached(prompt, model, temperature, count, self._create_ideas))
+            return self._create_ideas(prompt, model, temperature, count)
         except Exception as e:
             print(f"Failed to generate idea: {e}")
             return None
+
+    def _create_ideas(self, prompt, model, temperature, count):
+        """Request idea completions from OpenAI and return their raw contents"""
+        response = self.client.chat.completions.create(
+            **self._idea_request_kwargs(prompt, model, temperature, count)
+        )
+        return [choice.message.content for choice in response.choices]
+
+
+class _JSONObjectBuffer:
+    """Accumulates streamed text and reports when the top-level JSON object closes"""
+
+    def __init__(self):
+        self._parts = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.complete = False
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+    def feed(self, text):
+        """Append streamed text; returns True once the top-level object is complete"""
+        self._parts.append(text)
+
+        for char in text:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+
+        return self.complete
+
+
+# In-process copy of idea completions: {key: contents}, oldest first
+_idea_memo = {}
+
+_idea_cache = SQLiteCache(Config.IDEA_CACHE_PATH, "ideas", label="Idea cache")
+
+
+def _request_ideas_cached(prompt, model, temperature, count, create_ideas):
+    """
+    Disk-cached idea completions, memoized in process (failures raise, so aren't cached)
+
+    Keyed on the request settings only, so the memo never holds on to a
+    generator or its client; create_ideas is called on a miss.
+    """
+    key = _idea_cache_key(prompt, model, temperature, count)
+
+    contents = _idea_memo.pop(key, None)
+    if contents is None:
+        cached = _idea_cache.get(key)
+        if cached is not None:
+            print("✓ Using cached content idea")
+            contents = tuple(cached)
+        else:
+            contents = tuple(create_ideas(prompt, model, temperature, count))
+            _idea_cache.put(key, list(contents))
+
+    # Re-inserted on every hit, so the first entry is the least recently used
+    _idea_memo[key] = contents
+    if len(_idea_memo) > IDEA_MEMO_SIZE:
+        del _idea_memo[next(iter(_idea_memo))]
+    return contents
+
+
+def _idea_cache_key(prompt, model, temperature, count):
+    """Hash the request settings that determine an idea completion"""
+    return hashlib.blake2b(
+        f"{model}\0{temperature}\0{count}\0{prompt}".encode(), digest_size=16
+    ).hexdigest()
+
+
+
+
+
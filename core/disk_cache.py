@@ -0,0 +1,100 @@
+"""
+Small on-disk caches backed by SQLite
+
+Each cache is one table of JSON values keyed by a string (usually a content
+hash), with an optional time-to-live. Read and write failures are reported
+and otherwise ignored, so a broken cache never stops a run.
+"""
+
+import os
+import json
+import time
+import sqlite3
+
+
+class SQLiteCache:
+    """JSON values in one SQLite table, optionally expiring after ttl seconds"""
+
+    def __init__(self, path, table, ttl=None, label="Cache", memo=False):
+        """
+        Args:
+            path: SQLite database file (created on first use)
+            table: Table holding this cache's entries
+            ttl: Seconds before an entry expires (None = never)
+            label: Name used in warnings, e.g. "Search cache"
+            memo: Keep an in-process copy of entries in front of the database
+        """
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.label = label
+        self._memo = {} if memo else None  # {key: (value, expires)}
+        self._schema_checked = False
+
+    def get(self, key):
+        """Look up an unexpired value by key (None on miss or error)"""
+        now = time.time()
+
+        if self._memo is not None:
+            entry = self._memo.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                return entry[0]
+
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    f"SELECT value, expires FROM {self.table} "
+                    "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                    (key, now)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  {self.label} read failed: {e}")
+            return None
+
+        if not row:
+            return None
+        value = json.loads(row[0])
+        if self._memo is not None:
+            self._memo[key] = (value, row[1])
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable value under key; failures are non-fatal"""
+        expires = time.time() + self.ttl if self.ttl else None
+        if self._memo is not None:
+            self._memo[key] = (value, expires)
+
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {self.table} (key, value, expires) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), expires)
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️  {self.label} write failed: {e}")
+
+    def _connect(self):
+        """Open the database, creating the table if needed"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path)
+
+        if not self._schema_checked:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")}
+            if columns and columns != {"key", "value", "expires"}:
+                # Table from an older layout; its entries are only a cache
+                with conn:
+                    conn.execute(f"DROP TABLE {self.table}")
+            self._schema_checked = True
+
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL)"
+        )
+        return conn
@@ -1,9 +1,22 @@
 import os
-import yagmail
-import requests
 import time
-from dotenv import set_key
-from config import Config
+import random
+import smtplib
+from email.message import EmailMessage
+try:
+    # orjson parses straight from the response bytes; fall back to the stdlib if it isn't installed
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+from config import Config, set_env_keys
+from core.http_session import create_session
+
+# Gmail SMTP over implicit TLS (app passwords work here)
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 465
+
+# Refresh the TikTok access token when it has less than this many seconds left
+TIKTOK_TOKEN_REFRESH_MARGIN = 300
 
 class Distributor:
     """Distributes content to various platforms"""
@@ -12,6 +25,18 @@ class Distributor:
         self.sender_email = sender_email or Config.EMAIL_SENDER
         self.receiver_email = receiver_email or Config.EMAIL_RECEIVER
         self.app_password = app_password or Config.EMAIL_APP_PASSWORD
+        self._http = create_session()  # Keep-alive session for TikTok API calls
+        self._smtp = None  # SMTP connection, opened on first email and reused
+
+    def close(self):
+        """Close the pooled SMTP connection (if one is open) and the HTTP session"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+        self._http.close()
     
     def distribute(self, video_path, platform="email", metadata=None):
         """
@@ -55,16 +80,28 @@ class Distributor:
         try:
             print(f"Sending email to {self.receiver_email}...")
             
-            # Initialize yagmail client
-            yag = yagmail.SMTP(self.sender_email, self.app_password)
-            
-            # Send email with attachment
-            yag.send(
-                to=self.receiver_email,
-                subject=subject,
-                contents=body,
-                attachments=video_path
-            )
+            # Build the message; the attachment is read once, straight into the MIME part
+            message = EmailMessage()
+            message["Subject"] = subject
+            message["From"] = self.sender_email
+            message["To"] = self.receiver_email
+            message.set_content(body)
+
+            with open(video_path, "rb") as video_file:
+                message.add_attachment(
+                    video_file.read(),
+                    maintype="video",
+                    subtype="mp4",
+                    filename=os.path.basename(video_path)
+                )
+
+            # Reuse the SMTP connection (skips TLS + login) while it's still alive
+            if self._smtp is None or not self._smtp_alive():
+                self.close()
+                self._smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+                self._smtp.login(self.sender_email, self.app_password)
+
+            self._smtp.send_message(message)
             
             print("✓ Email sent successfully!")
             return True
@@ -73,6 +110,13 @@ class Distributor:
             print(f"✗ Failed to send email: {e}")
             return False
 
+    def _smtp_alive(self):
+        """Check the pooled SMTP connection with a NOOP"""
+        try:
+            return self._smtp.noop()[0] == 250
+        except Exception:
+            return False
+
     def _post_to_tiktok(self, video_path, metadata=None):
         """Post video to TikTok using Content Posting API"""
         if not os.path.exists(video_path):
@@ -135,18 +179,26 @@ class Distributor:
         }
 
         try:
-            response = requests.post(url, data=data, headers=headers)
+            response = self._http.post(url, data=data, headers=headers)
             response.raise_for_status()
-            result = response.json()
+            result = json_loads(response.content)
 
             if "access_token" in result:
-                # Save new tokens to .env
-                set_key(".env", "TIKTOK_ACCESS_TOKEN", result["access_token"])
-                set_key(".env", "TIKTOK_REFRESH_TOKEN", result["refresh_token"])
+                # 0 = unknown expiry: skip the proactive refresh and rely on refresh-on-401
+                expires_in = result.get("expires_in")
+                expires_at = time.time() + expires_in if expires_in else 0
+
+                # Save both new tokens (and the expiry) to .env in one atomic write
+                set_env_keys({
+                    "TIKTOK_ACCESS_TOKEN": result["access_token"],
+                    "TIKTOK_REFRESH_TOKEN": result["refresh_token"],
+                    "TIKTOK_ACCESS_TOKEN_EXPIRES_AT": str(int(expires_at))
+                })
 
                 # Update config in memory
                 Config.TIKTOK_ACCESS_TOKEN = result["access_token"]
                 Config.TIKTOK_REFRESH_TOKEN = result["refresh_token"]
+                Config.TIKTOK_ACCESS_TOKEN_EXPIRES_AT = expires_at
 
                 print("✓ TikTok access token refreshed")
                 return True
@@ -160,6 +212,12 @@ class Distributor:
 
     def _init_tiktok_upload(self, video_path, caption):
         """Initialize TikTok video upload and get upload URL"""
+        # Refresh ahead of expiry instead of waiting for a 401 (expiry 0 = unknown)
+        expires_at = Config.TIKTOK_ACCESS_TOKEN_EXPIRES_AT
+        if expires_at and expires_at - time.time() < TIKTOK_TOKEN_REFRESH_MARGIN:
+            print("⚠️  Access token about to expire, refreshing...")
+            self._refresh_tiktok_token()
+
         access_token = Config.TIKTOK_ACCESS_TOKEN
 
         if not access_token:
@@ -194,7 +252,7 @@ class Distributor:
         }
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = self._http.post(url, json=payload, headers=headers)
 
             # Check for token expiration
             if response.status_code == 401:
@@ -202,7 +260,7 @@ class Distributor:
                 if self._refresh_tiktok_token():
                     # Retry with new token
                     headers["Authorization"] = f"Bearer {Config.TIKTOK_ACCESS_TOKEN}"
-                    response = requests.post(url, json=payload, headers=headers)
+                    response = self._http.post(url, json=payload, headers=headers)
                 else:
                     return None, None
 
@@ -227,18 +285,19 @@ class Distributor:
     def _upload_video_to_tiktok(self, video_path, upload_url):
         """Upload video file to TikTok's servers"""
         try:
-            with open(video_path, 'rb') as video_file:
-                video_data = video_file.read()
-
-            video_size = len(video_data)
+            video_size = os.path.getsize(video_path)
 
             headers = {
                 "Content-Type": "video/mp4",
+                "Content-Length": str(video_size),
                 "Content-Range": f"bytes 0-{video_size-1}/{video_size}"
             }
 
             print(f"Uploading {video_size / (1024*1024):.2f} MB...")
-            response = requests.put(upload_url, data=video_data, headers=headers)
+
+            # Pass the file object so requests streams it instead of holding it all in memory
+            with open(video_path, 'rb') as video_file:
+                response = self._http.put(upload_url, data=video_file, headers=headers)
             response.raise_for_status()
 
             print("✓ Video uploaded successfully")
@@ -248,8 +307,14 @@ class Distributor:
             print(f"✗ Video upload failed: {e}")
             return False
 
-    def _check_tiktok_status(self, publish_id, max_retries=20, retry_delay=3):
-        """Check TikTok video processing status"""
+    def _check_tiktok_status(self, publish_id, max_retries=20, retry_delay=1.0, max_delay=5.0):
+        """
+        Check TikTok video processing status
+
+        Polls with jittered exponential backoff (retry_delay, x1.5 per
+        attempt, capped at max_delay) so quick publishes are noticed quickly
+        while slow ones don't hammer the API.
+        """
         access_token = Config.TIKTOK_ACCESS_TOKEN
         url = "https://open.tiktokapis.com/v2/post/publish/status/fetch/"
 
@@ -266,7 +331,7 @@ class Distributor:
 
         for attempt in range(max_retries):
             try:
-                response = requests.post(url, json=payload, headers=headers)
+                response = self._http.post(url, json=payload, headers=headers)
                 response.raise_for_status()
                 result = response.json()
 
@@ -283,7 +348,8 @@ class Distributor:
                     else:
                         # Still processing
                         print(".", end="", flush=True)
-                        time.sleep(retry_delay)
+                        delay = min(max_delay, retry_delay * (1.5 ** attempt))
+                        time.sleep(delay * random.uniform(0.8, 1.2))
                 else:
                     print(f"\n✗ Status check failed: {result}")
                     return False
@@ -0,0 +1,274 @@
+"""
+Resident FLUX image server
+
+Loading FLUX takes tens of seconds and several GB of weights, so with
+FLUX_SERVER=true the model lives in a long-running local process instead of
+every PosterBot run. MediaCollector talks to it through FluxServerClient,
+which starts the server on first use and reuses it on later runs.
+
+Run by hand with:
+    python -m core.flux_server --model schnell --quantize 4
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import subprocess
+import tempfile
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from config import Config
+from core.http_session import create_session
+
+HOST = "127.0.0.1"
+PID_FILE = os.path.join(tempfile.gettempdir(), "posterbot-flux.pid")
+
+# Seconds to wait for a freshly started server to load the model
+START_TIMEOUT = 600
+# Seconds to wait for a single image
+GENERATE_TIMEOUT = 300
+# Seconds a /health probe may take; nothing listening fails immediately
+HEALTH_TIMEOUT = 2
+
+
+class FluxServerClient:
+    """Generates FLUX images through the resident server (same interface as mflux's Flux1)"""
+
+    def __init__(self, model_name, quantize, width, height, steps, port=None):
+        import requests
+
+        self.port = port or Config.FLUX_SERVER_PORT
+        self.base_url = f"http://{HOST}:{self.port}"
+        # What the server must be running for its images to match a local load
+        self.expected = {
+            "model": model_name, "quantize": quantize, "width": width, "height": height, "steps": steps
+        }
+        self._http = create_session()
+        # No retries: a refused connection just means no server yet, and
+        # create_session's backoff would add ~3s to every probe
+        self._probe = requests.Session()
+        self._process = None  # Server started by this client, if any
+
+    def ensure_running(self):
+        """
+        Connect to the server, starting it if nothing is listening yet
+
+        Raises:
+            RuntimeError: If the server is running a different model/size, or never came up
+        """
+        health = self._health()
+        if health is None:
+            if not self._pid_alive():
+                self._spawn()
+            health = self._wait_until_ready()
+
+        if health != self.expected:
+            raise RuntimeError(f"FLUX server on port {self.port} is running {health}, expected {self.expected}")
+
+    def generate_image(self, seed, prompt, config=None):
+        """
+        Generate one image on the server
+
+        Args:
+            seed: Generation seed
+            prompt: Image prompt
+            config: Ignored; the server uses the settings it was started with
+
+        Returns:
+            PIL.Image.Image
+        """
+        from PIL import Image
+
+        response = self._http.post(
+            f"{self.base_url}/generate",
+            json={"seed": seed, "prompt": prompt},
+            timeout=GENERATE_TIMEOUT
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"FLUX server error {response.status_code}: {response.text[:200]}")
+
+        image = Image.open(BytesIO(response.content))
+        image.load()
+        return image
+
+    def _health(self):
+        """
+        Settings reported by a running server, or None if nothing is listening
+
+        Raises:
+            RuntimeError: If something else answers on the port with a non-JSON body
+        """
+        try:
+            response = self._probe.get(f"{self.base_url}/health", timeout=HEALTH_TIMEOUT)
+        except Exception:
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            raise RuntimeError(f"Port {self.port} is in use by something other than the FLUX server")
+
+    @staticmethod
+    def _pid_alive():
+        """Whether the PID file points at a live FLUX server (one still loading its model)"""
+        try:
+            with open(PID_FILE) as f:
+                pid = int(f.read().strip())
+            os.kill(pid, 0)
+        except (OSError, ValueError):
+            return False
+
+        # A stale PID file can name an unrelated process that reused the PID
+        try:
+            result = subprocess.run(
+                ["ps", "-p", str(pid), "-o", "command="],
+                capture_output=True, text=True, timeout=5
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return True  # Can't tell; assume it's ours
+        return "core.flux_server" in result.stdout
+
+    def _spawn(self):
+        """Start the server in the background, detached from this process"""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        os.makedirs(Config.LOGS_DIR, exist_ok=True)
+        log_path = os.path.join(Config.LOGS_DIR, "flux_server.log")
+        print(f"Starting FLUX server on port {self.port} (log: {log_path})...")
+
+        with open(log_path, "ab") as log:
+            self._process = subprocess.Popen(
+                [
+                    sys.executable, "-m", "core.flux_server",
+                    "--port", str(self.port),
+                    "--model", self.expected["model"],
+                    "--quantize", str(self.expected["quantize"]),
+                    "--width", str(self.expected["width"]),
+                    "--height", str(self.expected["height"]),
+                    "--steps", str(self.expected["steps"]),
+                ],
+                cwd=project_root,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True  # Keep serving after this run exits
+            )
+
+    def _wait_until_ready(self):
+        """Poll /health until the server has loaded its model"""
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            health = self._health()
+            if health is not None:
+                print("✓ FLUX server ready")
+                return health
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(f"FLUX server exited with code {self._process.returncode} (see logs/flux_server.log)")
+            time.sleep(1)
+        raise RuntimeError(f"FLUX server did not start within {START_TIMEOUT}s")
+
+
+def serve(port, model_name, quantize, width, height, steps=0):
+    """Load FLUX once and serve /health and /generate on the loopback interface"""
+    # A plain `kill` should still run the cleanup below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    # Written before the slow model load, so clients wait instead of starting a second server
+    with open(PID_FILE, "w") as f:
+        f.write(str(os.getpid()))
+    try:
+        _serve_forever(port, model_name, quantize, width, height, steps)
+    finally:
+        try:
+            os.remove(PID_FILE)
+        except OSError:
+            pass
+
+
+def _serve_forever(port, model_name, quantize, width, height, steps):
+    """Load the model, then handle requests until interrupted"""
+    from core.media_collector import MediaCollector
+
+    # Local mode: this process is the one that owns the model
+    collector = MediaCollector(target_width=width, target_height=height, image_source=f"flux-{model_name}")
+    collector.use_flux_server = False
+    collector.flux_model_name = model_name
+    collector.flux_quantize = quantize
+    collector.flux_steps = steps
+
+    flux = collector.flux
+    flux_config = collector._get_flux_config()
+    settings = json.dumps({
+        "model": model_name, "quantize": quantize, "width": width, "height": height,
+        "steps": flux_config.num_inference_steps
+    }).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/health":
+                self.send_error(404)
+                return
+            self._reply(200, "application/json", settings)
+
+        def do_POST(self):
+            if self.path != "/generate":
+                self.send_error(404)
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                result = flux.generate_image(
+                    seed=int(request["seed"]),
+                    prompt=request["prompt"],
+                    config=flux_config
+                )
+                image = result.image if hasattr(result, 'image') else result
+                del result
+                collector.release_flux_memory()
+
+                # PNG is lossless, so the client's JPEG save is the only lossy step.
+                # Level 1 deflate: the bytes only cross loopback, and encoding
+                # holds up the next generation
+                buffer = BytesIO()
+                image.save(buffer, format="PNG", compress_level=1)
+            except Exception as e:
+                self._reply(500, "text/plain", str(e).encode())
+                return
+            self._reply(200, "image/png", buffer.getvalue())
+
+        def _reply(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    # Single-threaded on purpose: one generation at a time on the GPU
+    server = HTTPServer((HOST, port), Handler)
+    print(f"✓ FLUX server listening on http://{HOST}:{port}", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        collector.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PosterBot resident FLUX image server")
+    parser.add_argument("--port", type=int, default=Config.FLUX_SERVER_PORT)
+    parser.add_argument("--model", default=Config.FLUX_MODEL, help="schnell or dev")
+    parser.add_argument("--quantize", type=int, default=Config.FLUX_QUANTIZE)
+    parser.add_argument("--width", type=int, default=Config.VIDEO_WIDTH)
+    parser.add_argument("--height", type=int, default=Config.VIDEO_HEIGHT)
+    parser.add_argument("--steps", type=int, default=Config.FLUX_STEPS, help="0 = model default")
+    args = parser.parse_args()
+
+    serve(args.port, args.model, args.quantize, args.width, args.height, args.steps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Shared HTTP session factory with keep-alive and retries
+"""
+
+
+def create_session(headers=None):
+    """
+    Create a requests.Session that reuses TCP/TLS connections across calls
+
+    Transient failures (429 and 5xx) are retried with backoff. Retries use
+    urllib3's default method list, so non-idempotent POSTs are never replayed.
+
+    Args:
+        headers: Optional default headers for every request (e.g. User-Agent)
+
+    Returns:
+        requests.Session
+    """
+    # Imported here so modules can import this factory without loading requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if headers:
+        session.headers.update(headers)
+
+    return session
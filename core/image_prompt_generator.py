@@ -3,8 +3,19 @@ ImagePromptGenerator - Generates contextual image prompts based on video script
 """
 
 import json
-from openai import OpenAI
+import hashlib
 from config import Config
+from core.openai_client import get_client
+from core.disk_cache import SQLiteCache
+
+IMAGE_PROMPT_MODEL = "gpt-4o-mini"
+IMAGE_PROMPT_TEMPERATURE = 1.2  # Creative but not too wild
+
+# Bump when the formatted prompt layout changes, so older cached sets are ignored
+PROMPT_CACHE_VERSION = 1
+
+# Formatted prompt sets per script, so a rerun doesn't ask OpenAI again
+_prompt_cache = SQLiteCache(Config.IMAGE_PROMPT_CACHE_PATH, "prompts", label="Image prompt cache")
 
 
 class ImagePromptGenerator:
@@ -12,7 +23,7 @@ class ImagePromptGenerator:
 
     def __init__(self, api_key=None):
         self.api_key = api_key or Config.OPENAI_API_KEY
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
 
     def generate_prompts(self, subject, script, count=10, prompt_config=None, sentences=None):
         """
@@ -32,15 +43,22 @@ class ImagePromptGenerator:
         system_prompt = self._build_system_prompt(count, prompt_config, sentences)
         user_prompt = self._build_user_prompt(subject, script, count, sentences)
 
+        # The same script (e.g. a rerun after a failed encode) reuses its prompts
+        key = _prompt_cache_key(system_prompt, user_prompt, count)
+        cached = _prompt_cache.get(key)
+        if cached is not None:
+            print("✓ Using cached image prompts")
+            return cached
+
         try:
             # Use structured outputs for reliable JSON parsing
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=IMAGE_PROMPT_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                temperature=1.2,  # Creative but not too wild
+                temperature=IMAGE_PROMPT_TEMPERATURE,
                 max_tokens=2000,
                 response_format={"type": "json_object"}
             )
@@ -67,6 +85,8 @@ class ImagePromptGenerator:
                     "name": f"ai_scene_{i+1}"
                 })
 
+            if formatted_prompts:
+                _prompt_cache.put(key, formatted_prompts)
             return formatted_prompts
 
         except Exception as e:
@@ -207,3 +227,17 @@ Remember:
 - Make them cinematic
 
 Return as JSON with "prompts" array."""
+
+
+def _prompt_cache_key(system_prompt, user_prompt, count):
+    """Hash everything that determines a prompt set (subject and script are in user_prompt)"""
+    return hashlib.blake2b(
+        f"v{PROMPT_CACHE_VERSION}\0{IMAGE_PROMPT_MODEL}\0{IMAGE_PROMPT_TEMPERATURE}\0{count}\0"
+        f"{system_prompt}\0{user_prompt}".encode(),
+        digest_size=16
+    ).hexdigest()
+
+
+
+
+
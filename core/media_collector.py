@@ -1,16 +1,57 @@
 import os
-import shutil
+import re
+import asyncio
+import hashlib
+import importlib.util
 import random
+import shutil
 import time
-import requests
-import cv2
-import numpy as np
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from duckduckgo_search import DDGS
 from config import Config
 from core.ai_prompt_generator import AIPromptGenerator
 from core.image_prompt_generator import ImagePromptGenerator
+from core.http_session import create_session
+from core.disk_cache import SQLiteCache
+
+# Search query cleanup (see MediaCollector._simplify_query)
+_QUERY_PAREN_RE = re.compile(r'\([^)]*\)')
+_YEAR_RANGE_RE = re.compile(r'(\d{4})-(\d{4})')  # En dashes are already spaces by then
+_DASH_TRANS = str.maketrans({'–': ' ', '—': ' '})
+
+# Bounding boxes (width, height) of the Pexels "src" renditions
+PEXELS_SIZES = {
+    "medium": (1200, 350),
+    "large": (940, 650),
+    "large2x": (1880, 1300),
+}
+
+# DuckDuckGo search variations, tried in random order until enough images are found
+DDG_SEARCH_TEMPLATES = (
+    "{query}", "{query} car", "{query} photo",
+    "{query} front", "{query} side", "{query} interior"
+)
+
+# Searches are spaced at least this far apart to avoid DuckDuckGo rate limits
+DDG_MIN_INTERVAL = 3.0  # seconds
+
+# Default inference steps per FLUX model; schnell is distilled for 1-4 steps
+FLUX_DEFAULT_STEPS = {"schnell": 4, "dev": 20}
+FLUX_SCHNELL_MAX_STEPS = 4
+
+# Machines at or below this much RAM start swapping with FLUX weights above 4-bit
+FLUX_LOW_MEMORY_BYTES = 16 * 1024 ** 3
+
+# EXIF tag saying how a photo must be rotated/flipped for display (1 = as stored)
+EXIF_ORIENTATION = 0x0112
+
+# cv2.imdecode flags that scale JPEGs down during decoding, largest factor first
+JPEG_REDUCED_FLAGS = (
+    (8, "IMREAD_REDUCED_COLOR_8"),
+    (4, "IMREAD_REDUCED_COLOR_4"),
+    (2, "IMREAD_REDUCED_COLOR_2"),
+)
 
 class MediaCollector:
     """Collects images/videos for content using various sources"""
@@ -29,10 +70,62 @@ class MediaCollector:
             self.image_source = Config.IMAGE_SOURCE
 
         self.pexels_api_key = Config.PEXELS_API_KEY
-        self.flux_model = None  # Lazy load FLUX model when needed
+        self._session = None  # Keep-alive session for API calls, created on first use
+        # Event loop and async client kept across batches so downloads reuse connections
+        self._loop = None
+        self._download_client = None
+        self._executor = None  # Worker threads, created on first use (see _pool)
+        self.flux_model = None  # Lazy load FLUX model when needed (see flux)
+        self._flux_config = None
         self.flux_model_name = Config.FLUX_MODEL  # "schnell" or "dev"
         self.flux_quantize = Config.FLUX_QUANTIZE  # Quantization level (4-8 bits)
+        self.flux_steps = Config.FLUX_STEPS  # Inference steps; 0 = model default
+        self.use_flux_server = Config.FLUX_SERVER  # Generate through the resident FLUX server
+        self.flux_low_ram = self._resolve_low_ram(Config.FLUX_LOW_RAM)  # Free MLX buffers after each image
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut down the worker threads, the pooled download client and its event loop"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+        if self._loop is None:
+            return
+        try:
+            if self._download_client is not None:
+                self._loop.run_until_complete(self._download_client.aclose())
+        except Exception:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = None
+            self._download_client = None
+
+    @property
+    def _pool(self):
+        """Thread pool for decode/resize/encode and background saves, created on first use"""
+        if self._executor is None:
+            # Decode/resize/encode release the GIL, so threads give real parallelism
+            self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return self._executor
     
+    @property
+    def _http(self):
+        """Shared requests session (requests is only imported when an API call is made)"""
+        if self._session is None:
+            self._session = create_session()
+        return self._session
+
     def collect_media(self, query, count=None, media_type="image", output_dir=None, script=None, sentences=None):
         """
         Collect media files based on query
@@ -58,54 +151,241 @@ class MediaCollector:
         if output_dir is None:
             output_dir = Config.IMAGES_DIR
         
-        # Clean up and recreate directory
-        if os.path.exists(output_dir):
-            shutil.rmtree(output_dir)
+        # Reuse the directory: image_N.jpg files are overwritten in place and
+        # anything left over from a previous run is removed afterwards
         os.makedirs(output_dir, exist_ok=True)
 
         if media_type == "image":
-            if self.image_source == "flux-schnell" or self.image_source == "flux-dev":
-                return self._collect_images_flux(query, count, output_dir, script, sentences)
-            elif self.image_source == "pexels":
-                return self._collect_images_pexels(query, count, output_dir)
-            elif self.image_source == "duckduckgo":
-                return self._collect_images_duckduckgo(query, count, output_dir)
-            else:
-                # Auto-fallback: Try FLUX first, then Pexels, then DuckDuckGo
-                print(f"⚠️  Unknown image source '{self.image_source}', trying FLUX first...")
-                try:
-                    return self._collect_images_flux(query, count, output_dir, script, sentences)
-                except Exception as e:
-                    print(f"⚠️  FLUX failed: {e}")
-                    print("Falling back to Pexels...")
-                    try:
-                        return self._collect_images_pexels(query, count, output_dir)
-                    except Exception as e2:
-                        print(f"⚠️  Pexels failed: {e2}")
-                        print("Falling back to DuckDuckGo...")
-                        return self._collect_images_duckduckgo(query, count, output_dir)
+            image_paths = self._collect_images(query, count, output_dir, script, sentences)
+            self._remove_stale_files(output_dir, image_paths)
+            return image_paths
         else:
             raise NotImplementedError("Video collection not yet implemented")
+
+    def _collect_images(self, query, count, output_dir, script=None, sentences=None):
+        """Collect images from the configured source"""
+        if self.image_source == "flux-schnell" or self.image_source == "flux-dev":
+            return self._collect_images_flux(query, count, output_dir, script, sentences)
+        elif self.image_source == "pexels":
+            return self._collect_images_pexels(query, count, output_dir)
+        elif self.image_source == "duckduckgo":
+            return self._collect_images_duckduckgo(query, count, output_dir)
+        else:
+            # Auto-fallback: Try FLUX first, then Pexels, then DuckDuckGo
+            print(f"⚠️  Unknown image source '{self.image_source}', trying FLUX first...")
+            try:
+                return self._collect_images_flux(query, count, output_dir, script, sentences)
+            except Exception as e:
+                print(f"⚠️  FLUX failed: {e}")
+                print("Falling back to Pexels...")
+                try:
+                    return self._collect_images_pexels(query, count, output_dir)
+                except Exception as e2:
+                    print(f"⚠️  Pexels failed: {e2}")
+                    print("Falling back to DuckDuckGo...")
+                    return self._collect_images_duckduckgo(query, count, output_dir)
+
+    def _remove_stale_files(self, output_dir, keep_paths):
+        """Delete files in output_dir that aren't part of this collection"""
+        keep = {os.path.basename(path) for path in keep_paths}
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.name not in keep and entry.is_file(follow_symlinks=False):
+                    os.unlink(entry.path)
     
-    def _collect_images_flux(self, query, count, output_dir, script=None, sentences=None):
-        """Collect images using FLUX AI model (local generation)"""
-        print(f"\n🎨 Generating {count} AI images for: {query}")
-        print(f"Using FLUX model: {self.flux_model_name}")
+    @property
+    def flux(self):
+        """
+        FLUX model, loaded on first use and kept for the collector's lifetime
+
+        Loading takes 30-60s and several GB of weights, so this is the only
+        place the model is created; failed generations never reset it. The
+        first load quantizes the full-precision weights and saves the result
+        under Config.FLUX_QUANTIZED_CACHE_DIR; later runs load that snapshot
+        directly instead of quantizing again.
+
+        With Config.FLUX_SERVER this is a client for the resident server
+        (started on first use), so the model isn't loaded in this process.
+        """
+        if self.flux_model is None and self.use_flux_server:
+            from core.flux_server import FluxServerClient
+            client = FluxServerClient(
+                self.flux_model_name, self.flux_quantize, self.target_width, self.target_height,
+                steps=self._flux_steps()
+            )
+            try:
+                client.ensure_running()
+                self.flux_model = client
+            except Exception as e:
+                print(f"⚠️  FLUX server unavailable ({e}), loading the model locally")
+                self.use_flux_server = False
+
+        if self.flux_model is None:
+            from mflux.generate import Flux1
+
+            self._warn_if_low_memory()
+            cache_path = self._flux_cache_path()
+            if os.path.isdir(cache_path):
+                print(f"Loading pre-quantized FLUX model from {cache_path}...")
+                try:
+                    from mflux.config.model_config import ModelConfig
+                    self.flux_model = Flux1(
+                        model_config=ModelConfig.from_name(self.flux_model_name),
+                        quantize=self.flux_quantize,
+                        local_path=cache_path
+                    )
+                except Exception as e:
+                    print(f"⚠️  Could not load cached FLUX weights ({e}), quantizing from scratch and replacing them")
 
-        try:
-            # Lazy load FLUX model
             if self.flux_model is None:
                 print("Loading FLUX model (this may take a minute on first run)...")
-                from mflux.generate import Flux1
-
                 self.flux_model = Flux1.from_name(
                     model_name=self.flux_model_name,
                     quantize=self.flux_quantize
                 )
-                print("✓ FLUX model loaded successfully")
+                self._save_flux_cache(cache_path)
+
+            print("✓ FLUX model loaded successfully")
+            if Config.FLUX_WARMUP:
+                self._warm_up_flux()
+        return self.flux_model
+
+    def _warm_up_flux(self):
+        """Run a 1-step 64x64 generation so MLX compiles its kernels before the real images"""
+        from mflux.generate import Config as MfluxConfig
 
-            # Determine prompt generation mode
-            prompt_data = self._generate_image_prompts(query, count, script, sentences)
+        start_time = time.time()
+        try:
+            self.flux_model.generate_image(
+                seed=0,
+                prompt="warmup",
+                config=MfluxConfig(num_inference_steps=1, height=64, width=64)
+            )
+        except Exception as e:
+            print(f"⚠️  FLUX warm-up failed (continuing): {e}")
+            return
+        print(f"✓ FLUX warmed up in {time.time() - start_time:.1f}s")
+
+    def _warn_if_low_memory(self):
+        """Warn when the quantization level is likely too heavy for this machine's RAM"""
+        total_ram = _total_ram()
+        if total_ram is None:
+            return  # Not available on this platform
+
+        if total_ram <= FLUX_LOW_MEMORY_BYTES and self.flux_quantize > 4:
+            print(
+                f"⚠️  {total_ram / 1024 ** 3:.0f}GB RAM with FLUX_QUANTIZE={self.flux_quantize}; "
+                "use FLUX_QUANTIZE=4 to avoid swapping"
+            )
+
+    @staticmethod
+    def _resolve_low_ram(setting):
+        """Resolve Config.FLUX_LOW_RAM; "auto" turns it on for machines at or below FLUX_LOW_MEMORY_BYTES"""
+        if setting != "auto":
+            return setting in ("1", "true", "yes")
+        total_ram = _total_ram()
+        return total_ram is not None and total_ram <= FLUX_LOW_MEMORY_BYTES
+
+    def release_flux_memory(self):
+        """
+        Hand MLX's cached buffers back to the OS after a generation (low-RAM mode only)
+
+        The VAE decode at the end of each image peaks well above the model's
+        steady-state footprint, and MLX keeps those buffers cached for reuse.
+        On 16GB machines that cache pushes the next image into swap. Failures
+        are only logged: the image itself is already done.
+        """
+        if not self.flux_low_ram:
+            return
+
+        import gc
+
+        try:
+            import mlx.core as mx
+
+            gc.collect()
+            # mx.clear_cache() replaced mx.metal.clear_cache() in newer MLX releases
+            clear_cache = getattr(mx, "clear_cache", None) or mx.metal.clear_cache
+            clear_cache()
+        except Exception as e:
+            print(f"⚠️  Could not release FLUX memory: {e}")
+
+    def _flux_cache_path(self):
+        """Folder holding the quantized weights for the current model and bit width"""
+        return os.path.join(
+            Config.FLUX_QUANTIZED_CACHE_DIR, f"{self.flux_model_name}-q{self.flux_quantize}"
+        )
+
+    def _save_flux_cache(self, cache_path):
+        """Save the freshly quantized model so the next run can skip quantization"""
+        # Save beside the final folder and rename, so an interrupted save is never loaded
+        tmp_path = f"{cache_path}.partial"
+        stale_path = f"{cache_path}.stale"
+        try:
+            print(f"Saving quantized FLUX weights to {cache_path} (one time)...")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+            self.flux_model.save_model(tmp_path)
+
+            # os.replace can't overwrite a non-empty folder, so move an
+            # unloadable snapshot aside first and delete it once the new one is in place
+            if os.path.isdir(cache_path):
+                shutil.rmtree(stale_path, ignore_errors=True)
+                os.replace(cache_path, stale_path)
+                print(f"Dropping stale FLUX snapshot at {cache_path}")
+            os.replace(tmp_path, cache_path)
+            shutil.rmtree(stale_path, ignore_errors=True)
+        except Exception as e:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            print(f"⚠️  Could not save quantized FLUX weights: {e}")
+
+    def _flux_steps(self):
+        """Inference steps for the current model (flux_steps, or the model's default)"""
+        num_steps = self.flux_steps or FLUX_DEFAULT_STEPS.get(self.flux_model_name, 20)
+        if self.flux_model_name == "schnell" and num_steps > FLUX_SCHNELL_MAX_STEPS:
+            # Schnell doesn't improve past 4 steps; more only costs time
+            print(f"⚠️  FLUX schnell is tuned for 2-4 steps; using {FLUX_SCHNELL_MAX_STEPS} instead of {num_steps}")
+            num_steps = FLUX_SCHNELL_MAX_STEPS
+        return num_steps
+
+    def _get_flux_config(self):
+        """Generation settings for the current model, built once"""
+        if self._flux_config is None:
+            from mflux.generate import Config as MfluxConfig
+
+            self._flux_config = MfluxConfig(
+                num_inference_steps=self._flux_steps(),
+                height=self.target_height,
+                width=self.target_width
+            )
+        return self._flux_config
+
+    def _collect_images_flux(self, query, count, output_dir, script=None, sentences=None):
+        """
+        Collect images using FLUX AI model (local generation)
+
+        Images are generated one prompt at a time: mflux's generate_image()
+        takes a single prompt and seed, and has no batch dimension to pack
+        several prompts into. All prompts are built up front, and each JPEG
+        is saved in the background while the next image generates.
+        """
+        print(f"\n🎨 Generating {count} AI images for: {query}")
+        print(f"Using FLUX model: {self.flux_model_name}")
+        if self.flux_model_name == "dev" and count > 4:
+            print(f"⚠️  FLUX dev takes many more steps per image than schnell; {count} images will take a while")
+
+        try:
+            if self.flux_model is None and (self.use_flux_server or importlib.util.find_spec("mflux")):
+                # Prompt generation is a network round trip and loading the model
+                # is local work, so ask for the prompts while the model loads
+                prompts_future = self._pool.submit(self._generate_image_prompts, query, count, script, sentences)
+                flux = self.flux
+                prompt_data = prompts_future.result()
+            else:
+                flux = self.flux
+
+                # Determine prompt generation mode
+                prompt_data = self._generate_image_prompts(query, count, script, sentences)
 
             # Append base style to all prompts (hardcoded for quality)
             base_style = self._get_base_style()
@@ -115,14 +395,13 @@ class MediaCollector:
                     prompt_info["prompt"] = f"{prompt_info['prompt']}, {base_style}"
 
             image_paths = []
-
-            # Determine inference steps based on model
-            if self.flux_model_name == "schnell":
-                num_steps = 4  # Schnell works best with 2-4 steps
-            else:
-                num_steps = 20  # Dev works best with 20-25 steps
-
-            from mflux.generate import Config as MfluxConfig
+            saves = []  # (index, path, future) for JPEG saves running in the background
+            # The server was started with its own generation settings
+            flux_config = None if self.use_flux_server else self._get_flux_config()
+            # One random base seed per collection; seed + i keeps images varied
+            # and makes any single image reproducible from the logged seed
+            base_seed = random.randint(0, 1000000)
+            print(f"Base seed: {base_seed}")
 
             for i, prompt_info in enumerate(prompt_data):
                 prompt_text = prompt_info["prompt"]
@@ -138,14 +417,10 @@ class MediaCollector:
                     # Generate image
                     start_time = time.time()
 
-                    result = self.flux_model.generate_image(
-                        seed=random.randint(0, 1000000),  # Random seed for variety
+                    result = flux.generate_image(
+                        seed=base_seed + i,
                         prompt=prompt_text,
-                        config=MfluxConfig(
-                            num_inference_steps=num_steps,
-                            height=self.target_height,
-                            width=self.target_width
-                        )
+                        config=flux_config
                     )
 
                     generation_time = time.time() - start_time
@@ -155,23 +430,28 @@ class MediaCollector:
                         image = result.image
                     else:
                         image = result
+                    del result
 
-                    # Save image
+                    # Save in the background while the next image generates
                     image_path = os.path.join(output_dir, f"image_{i}.jpg")
-
-                    # Convert to RGB if needed and save
-                    if hasattr(image, 'mode') and image.mode != 'RGB':
-                        image = image.convert('RGB')
-
-                    image.save(image_path, quality=95)
-                    image_paths.append(image_path)
+                    saves.append((i, image_path, self._pool.submit(self._save_jpeg, image, image_path)))
 
                     print(f"✓ Generated in {generation_time:.1f}s")
 
                 except Exception as e:
                     print(f"✗ Failed to generate image {i+1}: {e}")
                     # Continue with other images even if one fails
-                    continue
+
+                # Outside the try: a failed cleanup must not count against the image
+                if not self.use_flux_server:
+                    self.release_flux_memory()
+
+            for i, image_path, future in saves:
+                try:
+                    future.result()
+                    image_paths.append(image_path)
+                except Exception as e:
+                    print(f"✗ Failed to save image {i+1}: {e}")
 
             if not image_paths:
                 raise RuntimeError("Failed to generate any images with FLUX")
@@ -187,6 +467,12 @@ class MediaCollector:
         except Exception as e:
             raise RuntimeError(f"FLUX image generation failed: {e}")
 
+    def _save_jpeg(self, image, image_path):
+        """Save a PIL image as JPEG, converting to RGB if needed"""
+        if hasattr(image, 'mode') and image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.save(image_path, "JPEG", quality=Config.JPEG_QUALITY, optimize=True)
+
     def _collect_images_pexels(self, query, count, output_dir):
         """Collect images using Pexels API"""
         # For Pexels, we want to be more specific - always add "car" to the query
@@ -217,7 +503,7 @@ class MediaCollector:
                 "orientation": "landscape"  # Cars look better in landscape
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self._http.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -225,36 +511,20 @@ class MediaCollector:
 
             print(f"Found {len(photos)} photos on Pexels")
 
-            for photo in photos:
-                if len(image_paths) >= count:
-                    break
-
-                try:
-                    # Use the 'large' size for good quality
-                    img_url = photo["src"]["large"]
-                    print(f"Downloading: {img_url[:60]}...")
-
-                    # Download image
-                    img_response = requests.get(img_url, timeout=10)
-                    img_response.raise_for_status()
-
-                    # Process image
-                    image = Image.open(BytesIO(img_response.content)).convert("RGB")
-                    image = self._resize_and_crop(image, self.target_width, self.target_height)
-
-                    # Convert to OpenCV format and save
-                    arr = np.array(image)
-                    bgr_img = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-
-                    image_path = os.path.join(output_dir, f"image_{len(image_paths)}.jpg")
-                    cv2.imwrite(image_path, bgr_img)
-                    image_paths.append(image_path)
+            # Photos smaller than the target would only be upscaled
+            photos = [
+                photo for photo in photos
+                if photo.get("width", 0) >= self.target_width
+                and photo.get("height", 0) >= self.target_height
+            ]
 
-                    print(f"✓ Saved image {len(image_paths)}/{count}")
+            # Download candidates concurrently (extra in case some fail)
+            # Use the smallest rendition that still covers the target size
+            img_urls = [self._pick_src(photo) for photo in photos[:count * 2]]
+            print(f"Downloading {len(img_urls)} images...")
+            downloads = self._download_images(img_urls, timeout=10)
 
-                except Exception as e:
-                    print(f"✗ Failed to download image: {e}")
-                    continue
+            self._save_downloaded_images(img_urls, downloads, count, output_dir, image_paths)
 
         except Exception as e:
             print(f"✗ Pexels API error: {e}")
@@ -267,65 +537,82 @@ class MediaCollector:
         print(f"\n✓ Collected {len(image_paths)} images from Pexels")
         return image_paths
 
+    def _pick_src(self, photo):
+        """Pick the smallest Pexels rendition that covers the target size"""
+        width, height = photo["width"], photo["height"]
+        srcs = photo["src"]
+
+        for size in ("medium", "large", "large2x"):
+            if size not in srcs:
+                continue
+            max_width, max_height = PEXELS_SIZES[size]
+            # Pexels scales to fit the bounding box, never upscaling
+            scale = min(max_width / width, max_height / height, 1.0)
+            if width * scale >= self.target_width and height * scale >= self.target_height:
+                return srcs[size]
+
+        # Nothing covers the target; large2x is close enough without the original's size
+        return srcs.get("large2x") or srcs["large"]
+
     def _collect_images_duckduckgo(self, query, count, output_dir):
         """Collect images using DuckDuckGo search"""
         # Simplify query - remove special characters and year ranges that cause issues
         simple_query = self._simplify_query(query)
 
-        search_templates = [
-            "{query}", "{query} car", "{query} photo",
-            "{query} front", "{query} side", "{query} interior"
+        # Format every search up front, in random order
+        search_queries = [
+            template.format(query=simple_query)
+            for template in random.sample(DDG_SEARCH_TEMPLATES, k=len(DDG_SEARCH_TEMPLATES))
         ]
-        random.shuffle(search_templates)
+
+        from duckduckgo_search import DDGS
 
         image_paths = []
         retry_count = 0
         max_retries = 3
+        # Searches for the same subject overlap heavily; don't fetch or save repeats
+        seen_urls = set()
+        seen_hashes = set()
 
         with DDGS() as ddgs:
-            for template in search_templates:
+            for i, search_query in enumerate(search_queries):
                 if len(image_paths) >= count:
                     break
 
-                search_query = template.format(query=simple_query)
+                is_last = i == len(search_queries) - 1
                 print(f"Searching for: {search_query}")
 
                 try:
                     # Try to get more results per query to reduce number of queries
-                    results = ddgs.images(search_query, max_results=15)
-
+                    results = _search_cache.get(_search_cache_key(search_query))
+                    cached = results is not None
+                    if not cached:
+                        _ddg_throttle.acquire()
+                        results = [
+                            {"image": result["image"], "title": result.get("title", "")}
+                            for result in ddgs.images(search_query, max_results=15)
+                        ]
+                        if results:
+                            _search_cache.put(_search_cache_key(search_query), results)
+
+                    # Download this search's candidates concurrently
+                    needed = count - len(image_paths)
+                    img_urls = []
                     for result in results:
-                        if len(image_paths) >= count:
+                        if len(img_urls) >= needed * 2:
                             break
+                        if result["image"] not in seen_urls:
+                            seen_urls.add(result["image"])
+                            img_urls.append(result["image"])
+                    print(f"Downloading {len(img_urls)} images...")
+                    downloads = self._download_images(
+                        img_urls, headers={"User-Agent": "Mozilla/5.0"}, timeout=5
+                    )
 
-                        try:
-                            img_url = result["image"]
-                            print(f"Downloading: {img_url[:60]}...")
-
-                            # Download image
-                            headers = {"User-Agent": "Mozilla/5.0"}
-                            response = requests.get(img_url, headers=headers, timeout=5)
-
-                            # Process image
-                            image = Image.open(BytesIO(response.content)).convert("RGB")
-                            image = self._resize_and_crop(image, self.target_width, self.target_height)
-
-                            # Convert to OpenCV format and save
-                            arr = np.array(image)
-                            bgr_img = cv2.cvtColor(arr, cv2.COLOR_RGB2BGR)
-
-                            image_path = os.path.join(output_dir, f"image_{len(image_paths)}.jpg")
-                            cv2.imwrite(image_path, bgr_img)
-                            image_paths.append(image_path)
-
-                            print(f"✓ Saved image {len(image_paths)}/{count}")
-
-                        except Exception as e:
-                            print(f"✗ Failed: {e}")
-                            continue
+                    self._save_downloaded_images(
+                        img_urls, downloads, count, output_dir, image_paths, seen_hashes
+                    )
 
-                    # Longer delay between searches to avoid rate limits
-                    time.sleep(3)
                     retry_count = 0  # Reset retry count on success
 
                 except Exception as e:
@@ -336,8 +623,12 @@ class MediaCollector:
                         print(f"Max retries ({max_retries}) reached, stopping image collection")
                         break
 
-                    # Exponential backoff
-                    wait_time = 5 * (2 ** retry_count)
+                    # No point waiting if this is the last search we'll run
+                    if is_last:
+                        break
+
+                    # Exponential backoff (capped)
+                    wait_time = min(30, 5 * (2 ** retry_count))
                     print(f"Waiting {wait_time}s before retry...")
                     time.sleep(wait_time)
 
@@ -347,6 +638,180 @@ class MediaCollector:
         print(f"\nCollected {len(image_paths)} images")
         return image_paths
 
+    def _save_downloaded_images(self, urls, downloads, count, output_dir, image_paths, seen_hashes=None):
+        """
+        Process downloaded images in parallel and save them in download order
+
+        Args:
+            urls: Source URLs (for error messages)
+            downloads: Bytes or Exception per URL, as returned by _download_images
+            count: Total number of images wanted
+            output_dir: Directory to save images to
+            image_paths: List of saved paths, extended in place
+            seen_hashes: Optional set of content digests already used; identical
+                downloads (the same image under another URL) are skipped
+        """
+        if seen_hashes is None:
+            seen_hashes = set()
+
+        pending = []
+        for img_url, content in zip(urls, downloads):
+            if isinstance(content, Exception):
+                print(f"✗ Failed to download {img_url[:60]}: {content}")
+                continue
+
+            digest = hashlib.blake2b(content, digest_size=8).digest()
+            if digest in seen_hashes:
+                print(f"Skipping duplicate image {img_url[:60]}")
+                continue
+            seen_hashes.add(digest)
+            pending.append((img_url, content))
+
+        while pending and len(image_paths) < count:
+            # Only process as many as are still needed; refill if some fail
+            needed = count - len(image_paths)
+            batch, pending = pending[:needed], pending[needed:]
+            futures = [(img_url, self._pool.submit(self._encode_image, content)) for img_url, content in batch]
+
+            for img_url, future in futures:
+                try:
+                    encoded = future.result()
+                except Exception as e:
+                    print(f"✗ Failed to process {img_url[:60]}: {e}")
+                    continue
+
+                image_path = os.path.join(output_dir, f"image_{len(image_paths)}.jpg")
+                with open(image_path, "wb") as f:
+                    f.write(encoded)
+                image_paths.append(image_path)
+
+                print(f"✓ Saved image {len(image_paths)}/{count}")
+
+    def _encode_image(self, content):
+        """Decode downloaded bytes, resize/crop to target size and encode as JPEG"""
+        import cv2
+        import numpy as np
+        from PIL import Image
+
+        header = self._jpeg_header(content)
+        jpeg_size = header.size if header is not None else None
+        if jpeg_size == (self.target_width, self.target_height) and self._is_plain_jpeg(header):
+            # Already the right size: keep the original bytes, no decode or re-encode
+            return content
+
+        # Decode straight to BGR, skipping PIL and the RGB->BGR copy
+        bgr_img = cv2.imdecode(np.frombuffer(content, np.uint8), self._decode_flag(jpeg_size))
+
+        if bgr_img is None:
+            # Formats OpenCV can't decode (e.g. GIF): PIL only decodes, the
+            # resize/crop/encode below stay on OpenCV's SIMD path
+            rgb_img = np.asarray(Image.open(BytesIO(content)).convert("RGB"))
+            bgr_img = cv2.cvtColor(rgb_img, cv2.COLOR_RGB2BGR)
+
+        bgr_img = self._resize_and_crop_array(bgr_img, self.target_width, self.target_height)
+
+        ok, encoded = cv2.imencode(".jpg", bgr_img, [
+            cv2.IMWRITE_JPEG_QUALITY, Config.JPEG_QUALITY,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 1
+        ])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        return encoded.tobytes()
+
+    @staticmethod
+    def _jpeg_header(content):
+        """PIL image for JPEG bytes with only the header parsed, or None if not a JPEG"""
+        from PIL import Image
+
+        if not content.startswith(b"\xff\xd8"):
+            return None
+
+        try:
+            # Only parses the header; pixel data isn't decoded
+            image = Image.open(BytesIO(content))
+        except Exception:
+            return None
+        return image if image.format == "JPEG" else None
+
+    @staticmethod
+    def _is_plain_jpeg(header):
+        """
+        Whether a JPEG can be used byte-for-byte, as the decode/re-encode path would produce it
+
+        That path applies EXIF rotation and always writes baseline YCbCr, so
+        rotated, progressive, CMYK or grayscale files are re-encoded instead.
+        """
+        if header.mode != "RGB" or header.info.get("progressive") or header.info.get("progression"):
+            return False
+        try:
+            orientation = header.getexif().get(EXIF_ORIENTATION, 1)
+        except Exception:
+            return False
+        return orientation == 1
+
+    def _decode_flag(self, jpeg_size):
+        """
+        Pick the cv2.imdecode flag for a download, given its JPEG size (or None)
+
+        OpenCV decodes JPEGs with libjpeg-turbo, which can scale by 1/2, 1/4
+        or 1/8 during the IDCT. Much of the decode work is skipped, so large
+        photos are reduced as far as possible while still covering the target.
+        """
+        import cv2
+
+        if jpeg_size is None:
+            return cv2.IMREAD_COLOR
+
+        width, height = jpeg_size
+        max_factor = min(width / self.target_width, height / self.target_height)
+        for factor, flag in JPEG_REDUCED_FLAGS:
+            if max_factor >= factor:
+                return getattr(cv2, flag)
+        return cv2.IMREAD_COLOR
+
+    def _download_images(self, urls, headers=None, timeout=10):
+        """
+        Download several URLs concurrently
+
+        Args:
+            urls: List of URLs to fetch
+            headers: Optional request headers
+            timeout: Total time allowed per request, in seconds
+
+        Returns:
+            list: Response bytes, or the Exception raised, for each URL (same order)
+        """
+        if not urls:
+            return []
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self._download_all(urls, headers, timeout))
+
+    async def _download_all(self, urls, headers, timeout):
+        """Fetch all URLs over the collector's pooled async client"""
+        import httpx
+
+        if self._download_client is None:
+            limits = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+            self._download_client = httpx.AsyncClient(limits=limits, follow_redirects=True)
+        client = self._download_client
+
+        async def fetch(client, url):
+            response = await client.get(url, headers=headers, timeout=timeout)
+            response.raise_for_status()
+            # The body is read once into bytes; np.frombuffer and BytesIO wrap it
+            # without copying, so this is the only copy of the payload
+            return response.content
+
+        async def download_one(client, url):
+            # httpx timeouts apply per read; also cap the whole request so a
+            # slow trickle can't hold up the batch
+            return await asyncio.wait_for(fetch(client, url), timeout)
+
+        return await asyncio.gather(
+            *(download_one(client, url) for url in urls), return_exceptions=True
+        )
+
     def _generate_image_prompts(self, query, count, script, sentences=None):
         """
         Generate image prompts using AI or templates based on config
@@ -404,31 +869,37 @@ class MediaCollector:
             return self.prompt_config.get_image_base_style()
         return AIPromptGenerator.DEFAULT_BASE_STYLE
 
-    def _simplify_query(self, query):
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _simplify_query(query):
         """Simplify search query while keeping brand/model info"""
-        import re
+        # Plain queries (no parentheses, dashes or year ranges) only need whitespace cleanup
+        if '(' not in query and '-' not in query and '–' not in query and '—' not in query:
+            return ' '.join(query.split())
 
         # Remove content in parentheses (like generation codes)
-        simplified = re.sub(r'\([^)]*\)', '', query)
-
-        # Remove special unicode characters like em-dash
-        simplified = simplified.replace('–', ' ').replace('—', ' ')
+        # and special unicode characters like em-dash (one translate pass)
+        simplified = _QUERY_PAREN_RE.sub('', query).translate(_DASH_TRANS)
 
         # Keep year range but make it cleaner (e.g., "1994-2001" becomes "1994 2001")
         # This helps Pexels understand we want that era
-        simplified = re.sub(r'(\d{4})[-–](\d{4})', r'\1 \2', simplified)
+        simplified = _YEAR_RANGE_RE.sub(r'\1 \2', simplified)
 
         # Clean up extra spaces
-        simplified = ' '.join(simplified.split())
+        return ' '.join(simplified.split())
+
+    def _resize_and_crop_array(self, image, target_width, target_height):
+        """Resize and crop an OpenCV (numpy) image to target dimensions"""
+        import cv2
+
+        height, width = image.shape[:2]
+        if width == target_width and height == target_height:
+            return image
 
-        return simplified.strip()
-    
-    def _resize_and_crop(self, image, target_width, target_height):
-        """Resize and crop image to target dimensions"""
         # Calculate aspect ratios
-        img_ratio = image.width / image.height
+        img_ratio = width / height
         target_ratio = target_width / target_height
-        
+
         # Resize image
         if img_ratio > target_ratio:
             new_height = target_height
@@ -436,13 +907,59 @@ class MediaCollector:
         else:
             new_width = target_width
             new_height = int(new_width / img_ratio)
-        
-        image = image.resize((new_width, new_height), resample=Image.LANCZOS)
-        
+
+        # INTER_AREA is sharper and faster for shrinking; Lanczos for enlarging
+        if (new_width, new_height) != (width, height):
+            interpolation = cv2.INTER_AREA if new_width < width else cv2.INTER_LANCZOS4
+            image = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+
+        if new_width == target_width and new_height == target_height:
+            return image
+
         # Crop the center
         left = (new_width - target_width) // 2
         top = (new_height - target_height) // 2
-        right = left + target_width
-        bottom = top + target_height
-        
-        return image.crop((left, top, right, bottom))
+
+        return image[top:top + target_height, left:left + target_width]
+
+
+def _total_ram():
+    """Physical memory in bytes, or None where sysconf doesn't report it"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+class _Throttle:
+    """Spaces calls at least `interval` seconds apart, sleeping only for what's left"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._last = float("-inf")
+
+    def acquire(self):
+        wait = self._last + self.interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last = time.monotonic()
+
+
+# Shared by all collectors, since the rate limit is per client
+_ddg_throttle = _Throttle(DDG_MIN_INTERVAL)
+
+
+# DuckDuckGo results, memoized in process in front of the on-disk copy
+_search_cache = SQLiteCache(
+    Config.SEARCH_CACHE_PATH, "searches", ttl=Config.SEARCH_CACHE_TTL, label="Search cache", memo=True
+)
+
+
+def _search_cache_key(search_query):
+    """Hash a search query into a cache key"""
+    return hashlib.sha1(search_query.encode()).hexdigest()
+
+
+
+
+
@@ -0,0 +1,35 @@
+"""
+Shared OpenAI client factory
+"""
+
+from functools import lru_cache
+from config import Config
+
+
+def get_client(api_key=None):
+    """
+    Get the process-wide OpenAI client for an API key
+
+    Every stage (ideas, scripts, image prompts, TTS) shares one client per key,
+    so requests reuse the same connection pool instead of each stage paying for
+    its own TCP/TLS handshakes.
+
+    Args:
+        api_key: OpenAI API key (default: Config.OPENAI_API_KEY)
+
+    Returns:
+        openai.OpenAI
+    """
+    return _client_for_key(api_key or Config.OPENAI_API_KEY)
+
+
+@lru_cache(maxsize=None)
+def _client_for_key(api_key):
+    """Create the OpenAI client for an API key (once per key)"""
+    from openai import OpenAI, DefaultHttpxClient
+    try:
+        # HTTP/2 multiplexes follow-up requests over one connection
+        http_client = DefaultHttpxClient(http2=True)
+    except ImportError:
+        http_client = DefaultHttpxClient()  # h2 not installed
+    return OpenAI(api_key=api_key, http_client=http_client)
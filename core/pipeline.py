@@ -1,6 +1,8 @@
 import os
 import shutil
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from config import Config
 from core.content_generator import ContentIdeaGenerator
@@ -11,6 +13,11 @@ from core.video_composer import VideoComposer
 from core.distributor import Distributor
 from core.prompt_config import PromptConfig
 
+BANNER = "=" * 60
+
+# Worker processes used for parallel_iterations=0 (bounded by API rate limits)
+MAX_AUTO_WORKERS = 4
+
 class Pipeline:
     """Orchestrates the entire video creation and distribution workflow"""
 
@@ -37,12 +44,25 @@ class Pipeline:
         # Setup logging
         self._setup_logging()
     
+    def close(self):
+        """Release the components' pooled threads and connections"""
+        self.media_collector.close()
+        self.distributor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def _setup_logging(self):
         """Setup logging configuration"""
         os.makedirs(Config.LOGS_DIR, exist_ok=True)
         
-        log_file = os.path.join(Config.LOGS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
-        
+        # PID in the name: parallel workers start within the same second
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        log_file = os.path.join(Config.LOGS_DIR, f"pipeline_{timestamp}_{os.getpid()}.log")
+
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
@@ -58,30 +78,29 @@ class Pipeline:
         """Clean up temporary audio and image files after video creation"""
         try:
             # Clean audio directory
-            if os.path.exists(Config.AUDIO_DIR):
-                for file in os.listdir(Config.AUDIO_DIR):
-                    file_path = os.path.join(Config.AUDIO_DIR, file)
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
+            if self._remove_files(Config.AUDIO_DIR):
                 self.logger.info("✓ Cleaned up audio files")
 
             # Clean images directory
-            if os.path.exists(Config.IMAGES_DIR):
-                for file in os.listdir(Config.IMAGES_DIR):
-                    file_path = os.path.join(Config.IMAGES_DIR, file)
-                    if os.path.isfile(file_path):
-                        os.remove(file_path)
+            if self._remove_files(Config.IMAGES_DIR):
                 self.logger.info("✓ Cleaned up image files")
 
-            # Clean combined audio output file
-            combined_audio = os.path.join(Config.OUTPUT_DIR, "combined_output.wav")
-            if os.path.exists(combined_audio):
-                os.remove(combined_audio)
-
         except Exception as e:
-            self.logger.warning(f"⚠️  Error cleaning up temp files: {e}")
+            self.logger.warning("⚠️  Error cleaning up temp files: %s", e)
 
-    def run(self, iterations=1, distribute_to="email", prompt_config=None):
+    @staticmethod
+    def _remove_files(directory):
+        """Delete the files directly inside directory; returns False if it doesn't exist"""
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def run(self, iterations=1, distribute_to="email", prompt_config=None, parallel_iterations=1):
         """
         Run the complete pipeline
 
@@ -89,6 +108,9 @@ class Pipeline:
             iterations: Number of videos to create
             distribute_to: Platform to distribute to ("email", "instagram", etc.)
             prompt_config: PromptConfig object (overrides instance config if provided)
+            parallel_iterations: Number of iterations to run at once in worker processes;
+                0 picks min(iterations, MAX_AUTO_WORKERS). Ignored for FLUX, which needs
+                the GPU to itself
 
         Returns:
             list: Paths to created videos
@@ -101,36 +123,152 @@ class Pipeline:
         config = prompt_config or self.prompt_config
 
         config_name = config.get_name()
-        self.logger.info(f"Starting pipeline: {iterations} iterations, config={config_name}")
+        self.logger.info("Starting pipeline: %d iterations, config=%s", iterations, config_name)
 
-        created_videos = []
+        if parallel_iterations <= 0:
+            parallel_iterations = MAX_AUTO_WORKERS
+        workers = min(parallel_iterations, iterations)
+        if workers > 1 and config.get_image_strategy() not in ("pexels", "duckduckgo"):
+            self.logger.warning("⚠️  FLUX image generation can't share the GPU; running iterations one at a time")
+            workers = 1
 
-        for i in range(iterations):
-            self.logger.info(f"\n{'='*60}")
-            self.logger.info(f"ITERATION {i+1}/{iterations}")
-            self.logger.info(f"{'='*60}\n")
+        if workers > 1:
+            created_videos = self._run_parallel(iterations, workers, distribute_to, config)
+        else:
+            created_videos = self._run_sequential(iterations, distribute_to, config)
 
-            try:
-                video_path = self._run_single_iteration(distribute_to, i+1, config)
-                if video_path:
-                    created_videos.append(video_path)
+        self.logger.info(
+            "\n%s\nPipeline complete: %d/%d videos created\n%s\n",
+            BANNER, len(created_videos), iterations, BANNER
+        )
 
-            except Exception as e:
-                self.logger.error(f"Error in iteration {i+1}: {e}", exc_info=True)
-                continue
+        return created_videos
 
-        self.logger.info(f"\n{'='*60}")
-        self.logger.info(f"Pipeline complete: {len(created_videos)}/{iterations} videos created")
-        self.logger.info(f"{'='*60}\n")
+    def _run_sequential(self, iterations, distribute_to, config):
+        """
+        Run iterations one after another in this process
+
+        Narration and images (the stages that share the scratch directories
+        and the GPU) run strictly in order on this thread, and the rest is
+        overlapped: the next iteration's idea and script are written while
+        this one's media is collected, and each finished media set is moved
+        to its own staging folder, then encoded and distributed in the
+        background while the next one is made.
+        """
+        deliveries = []  # (iteration, future) for encodes/distributions still in flight
+
+        with ThreadPoolExecutor(max_workers=1) as writer, ThreadPoolExecutor(max_workers=1) as sender:
+            next_content = writer.submit(self._write_content, config)
+
+            for i in range(iterations):
+                self.logger.info("\n%s\nITERATION %d/%d\n%s\n", BANNER, i+1, iterations, BANNER)
+
+                try:
+                    content = next_content.result()
+                except Exception as e:
+                    self.logger.error("Error in iteration %d: %s", i+1, e, exc_info=True)
+                    content = None
+
+                # Start on the next idea/script before this video is produced
+                if i + 1 < iterations:
+                    next_content = writer.submit(self._write_content, config)
+
+                try:
+                    if not content:
+                        continue
+
+                    media = self._collect_media(content)
+                    if not media:
+                        continue
+
+                    # Free the scratch directories for the next iteration
+                    media = self._stage_media(media, i+1)
+                    self._cleanup_temp_files()
+                    deliveries.append((i+1, sender.submit(
+                        self._encode_and_distribute, media, content, i+1, distribute_to
+                    )))
+
+                except Exception as e:
+                    self.logger.error("Error in iteration %d: %s", i+1, e, exc_info=True)
+                    continue
+
+            created_videos = []
+            for iteration_num, future in deliveries:
+                try:
+                    video_path = future.result()
+                    if video_path:
+                        created_videos.append(video_path)
+                except Exception as e:
+                    self.logger.error("Error in iteration %d: %s", iteration_num, e, exc_info=True)
+
+        return created_videos
+
+    def _run_parallel(self, iterations, workers, distribute_to, config):
+        """Run iterations across worker processes, each with its own pipeline and scratch dirs"""
+        self.logger.info("Running %d iterations across %d worker processes", iterations, workers)
+
+        # Spawn so workers don't inherit this process's threads, event loops or log buffers
+        context = multiprocessing.get_context("spawn")
+        created_videos = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(config.config_path,)
+            ) as pool:
+                futures = [
+                    pool.submit(_run_iteration_in_worker, distribute_to, i+1)
+                    for i in range(iterations)
+                ]
+
+                for i, future in enumerate(futures):
+                    try:
+                        video_path = future.result()
+                        if video_path:
+                            created_videos.append(video_path)
+                    except Exception as e:
+                        self.logger.error("Error in iteration %d: %s", i+1, e, exc_info=True)
+        finally:
+            # Pool workers exit without running atexit hooks, so their
+            # per-PID scratch dirs are removed here once they've all stopped
+            shutil.rmtree(_workers_dir(), ignore_errors=True)
 
         return created_videos
     
+    def _collect_images(self, subject, script, sentences, count=None):
+        """Collect one image per sentence (or count images)"""
+        return self.media_collector.collect_media(
+            subject,
+            count=count if count is not None else len(sentences),
+            script=script,  # Pass script for AI-generated image prompts
+            sentences=sentences  # Pass sentences for 1:1 image-sentence mapping
+        )
+
     def _run_single_iteration(self, distribute_to, iteration_num, prompt_config=None):
         """Run a single iteration of the pipeline"""
 
         # Use provided config or instance config
         config = prompt_config or self.prompt_config
 
+        content = self._write_content(config)
+        if not content:
+            return None
+
+        video_path = self._produce_video(content, iteration_num)
+        if not video_path:
+            return None
+
+        self._distribute(video_path, content, distribute_to)
+        return video_path
+
+    def _write_content(self, config):
+        """
+        Steps 1-2: generate an idea and write its script
+
+        Returns:
+            tuple: (subject, concept, script), or None on failure
+        """
         # Step 1: Generate idea
         self.logger.info("Step 1: Generating content idea...")
         idea = self.idea_generator.generate_idea(prompt_config=config)
@@ -142,8 +280,8 @@ class Pipeline:
         subject = idea.get("subject", "Unknown")
         concept = idea.get("concept", "Unknown")
 
-        self.logger.info(f"Subject: {subject}")
-        self.logger.info(f"Concept: {concept}")
+        self.logger.info("Subject: %s", subject)
+        self.logger.info("Concept: %s", concept)
 
         # Step 2: Write script
         self.logger.info("\nStep 2: Writing script...")
@@ -153,33 +291,119 @@ class Pipeline:
             self.logger.error("Failed to write script")
             return None
 
-        self.logger.info(f"Script:\n{script}")
-        
-        # Step 3: Generate audio
-        self.logger.info("\nStep 3: Generating audio...")
-        durations, sentences = self.tts.generate_audio(script)
+        self.logger.info("Script:\n%s", script)
+        return subject, concept, script
+
+    def _produce_video(self, content, iteration_num):
+        """
+        Steps 3-5: narrate, collect images and encode the video
 
-        if not durations:
-            self.logger.error("Failed to generate audio")
+        Returns:
+            str: Path to the created video, or None on failure
+        """
+        media = self._collect_media(content)
+        if not media:
             return None
 
-        self.logger.info(f"Generated {len(durations)} audio segments")
+        video_path = self._encode_video(media, content, iteration_num)
+
+        # Clean up temporary files after video creation
+        self._cleanup_temp_files()
+        return video_path
+
+    def _encode_and_distribute(self, media, content, iteration_num, distribute_to):
+        """Steps 5-6 for media staged by _stage_media (runs in the background)"""
+        try:
+            video_path = self._encode_video(media, content, iteration_num)
+        finally:
+            shutil.rmtree(os.path.dirname(media[0][0]), ignore_errors=True)
+
+        if video_path:
+            self._distribute(video_path, content, distribute_to)
+        return video_path
+
+    @staticmethod
+    def _stage_media(media, iteration_num):
+        """Move an iteration's images out of the shared scratch dir into their own folder"""
+        image_paths, durations, audio = media
+        staging_dir = os.path.join(Config.OUTPUT_DIR, "staging", f"{iteration_num:03d}")
+        os.makedirs(staging_dir, exist_ok=True)
+
+        staged_paths = []
+        for path in image_paths:
+            staged_path = os.path.join(staging_dir, os.path.basename(path))
+            os.replace(path, staged_path)  # Same filesystem, so just a rename
+            staged_paths.append(staged_path)
+        return staged_paths, durations, audio
+
+    def _collect_media(self, content):
+        """
+        Steps 3-4: narrate the script and collect one image per sentence
+
+        Returns:
+            tuple: (image_paths, durations, audio) where audio is the combined
+            narration as an AudioSegment, or None on failure
+        """
+        subject, _, script = content
+
+        if Config.OVERLAP_AUDIO_AND_IMAGES:
+            # Steps 3 & 4: Both only need the script, so narrate in the background
+            # while images are collected (FLUX stays on the main thread)
+            self.logger.info("\nSteps 3-4: Generating audio and collecting images...")
+            sentences = self.tts.split_sentences(script)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                audio_future = executor.submit(self.tts.generate_audio, script)
+                image_paths = self._collect_images(subject, script, sentences)
+                durations, sentences, spoken = audio_future.result()
+
+            if not durations:
+                self.logger.error("Failed to generate audio")
+                return None
+
+            self.logger.info("Generated %d audio segments", len(durations))
+
+            if not image_paths:
+                self.logger.error("Failed to collect images")
+                return None
+
+            # Sentences whose audio failed have no duration; drop their images
+            # so every remaining image still sits under its own sentence
+            if len(spoken) < len(sentences):
+                image_paths = [image_paths[i] for i in spoken if i < len(image_paths)]
+        else:
+            # Step 3: Generate audio
+            self.logger.info("\nStep 3: Generating audio...")
+            durations, sentences, spoken = self.tts.generate_audio(script)
+
+            if not durations:
+                self.logger.error("Failed to generate audio")
+                return None
+
+            self.logger.info("Generated %d audio segments", len(durations))
+
+            # Step 4: Collect media
+            self.logger.info("\nStep 4: Collecting images...")
+            # One image per narrated sentence, so a failed sentence gets no image
+            spoken_sentences = [sentences[i] for i in spoken]
+            image_paths = self._collect_images(subject, script, spoken_sentences)
+
+            if not image_paths:
+                self.logger.error("Failed to collect images")
+                return None
+
+        self.logger.info("Collected %d images", len(image_paths))
+        return image_paths, durations, self.tts.combined_audio
+
+    def _encode_video(self, media, content, iteration_num):
+        """
+        Step 5: encode the collected images and narration into a video
+
+        Returns:
+            str: Path to the created video, or None on failure
+        """
+        image_paths, durations, audio = media
+        subject = content[0]
 
-        # Step 4: Collect media
-        self.logger.info("\nStep 4: Collecting images...")
-        image_paths = self.media_collector.collect_media(
-            subject,
-            count=len(durations),
-            script=script,  # Pass script for AI-generated image prompts
-            sentences=sentences  # Pass sentences for 1:1 image-sentence mapping
-        )
-        
-        if not image_paths:
-            self.logger.error("Failed to collect images")
-            return None
-        
-        self.logger.info(f"Collected {len(image_paths)} images")
-        
         # Step 5: Create video
         self.logger.info("\nStep 5: Creating video...")
         # Create a safe filename from the subject
@@ -187,21 +411,25 @@ class Pipeline:
         safe_name = safe_name[:50]  # Limit length
         output_name = f"{iteration_num:03d}_{safe_name}"
         
+        # Hand over the narration still in memory; the composer pipes it to ffmpeg
         video_path = self.video_composer.create_video(
             image_paths, 
             durations, 
-            output_name
+            output_name,
+            audio=audio
         )
         
         if not video_path:
             self.logger.error("Failed to create video")
             return None
+        return video_path
 
-        # Clean up temporary files after video creation
-        self._cleanup_temp_files()
+    def _distribute(self, video_path, content, distribute_to):
+        """Step 6: send a finished video to the distribution platform"""
+        subject, concept, _ = content
 
         # Step 6: Distribute
-        self.logger.info(f"\nStep 6: Distributing to {distribute_to}...")
+        self.logger.info("\nStep 6: Distributing to %s...", distribute_to)
         
         metadata = {
             "subject": f"PosterBot Video: {concept}",
@@ -218,5 +446,35 @@ class Pipeline:
             self.logger.info("✓ Distribution successful")
         else:
             self.logger.warning("✗ Distribution failed")
-        
-        return video_path
+        return success
+
+
+# Pipeline owned by each worker process (see Pipeline._run_parallel)
+_worker_pipeline = None
+
+
+def _workers_dir():
+    """Parent folder of the worker processes' scratch directories"""
+    return os.path.join(Config.OUTPUT_DIR, "workers")
+
+
+def _init_worker(config_path):
+    """Give a worker process private scratch directories and its own pipeline"""
+    global _worker_pipeline
+
+    # Audio, images and the combined narration live at fixed paths under
+    # OUTPUT_DIR, so concurrent iterations need their own copies. Videos and
+    # caches keep their shared locations.
+    scratch_dir = os.path.join(_workers_dir(), str(os.getpid()))
+    Config.OUTPUT_DIR = scratch_dir
+    Config.AUDIO_DIR = os.path.join(scratch_dir, "audio")
+    Config.IMAGES_DIR = os.path.join(scratch_dir, "images")
+    os.makedirs(Config.AUDIO_DIR, exist_ok=True)
+    os.makedirs(Config.IMAGES_DIR, exist_ok=True)
+
+    _worker_pipeline = Pipeline(PromptConfig(config_path))
+
+
+def _run_iteration_in_worker(distribute_to, iteration_num):
+    """Run one iteration on this worker's pipeline"""
+    return _worker_pipeline._run_single_iteration(distribute_to, iteration_num)
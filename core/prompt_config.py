@@ -2,14 +2,112 @@
 PromptConfig - Loads and manages YAML-based prompt configurations
 """
 
-import yaml
 import os
-from typing import Dict, List, Any, Optional
+import sys
+import copy
+import pickle
+import hashlib
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from core.ai_prompt_generator import PromptBuilder
+
+# Parsed configs by path: (mtime_ns, size, data), least recently used first
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+CONFIG_DIR = "prompt_configs"
+
+# Pickled parses of config files, named <file>.<content hash>.pkl
+PARSE_CACHE_DIR = ".cache"
+
+# Listing of CONFIG_DIR (file name -> path), rebuilt when the directory's mtime changes
+_DIR_CACHE: Dict[str, str] = {}
+_DIR_MTIME: Optional[int] = None
+
+
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """LibYAML's C parser when PyYAML was built with it, else the pure-Python one"""
+    # Imported on first parse so config listing and cached loads skip PyYAML
+    try:
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return loader
+
+
+def _parse_yaml_cached(config_path: str, raw: bytes) -> Any:
+    """
+    Parse YAML bytes, reusing a pickled parse of identical content
+
+    The pickle lives next to the config in .cache/ and is named after a hash
+    of the file's bytes, so an edited file can never be served a stale parse.
+    """
+    cache_dir = os.path.join(os.path.dirname(config_path), PARSE_CACHE_DIR)
+    base = os.path.basename(config_path)
+    digest = hashlib.blake2b(raw, digest_size=12).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{base}.{digest}.pkl")
+
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        pass  # Missing or unreadable cache, parse below
+
+    import yaml
+    data = yaml.load(raw, Loader=_yaml_loader())
+    if not data:
+        return data
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename, so concurrent workers never read a partial pickle
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f, protocol=5)
+        os.replace(tmp_path, cache_path)
+
+        # Drop parses of older versions of this file
+        prefix = f"{base}."
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name.endswith(".pkl") and entry.path != cache_path:
+                    os.remove(entry.path)
+    except OSError:
+        pass  # Cache is an optimization only
+
+    return data
+
+
+def _config_dir_entries() -> Dict[str, str]:
+    """File names in CONFIG_DIR mapped to their paths (empty if the directory is missing)"""
+    global _DIR_CACHE, _DIR_MTIME
+
+    try:
+        mtime = os.stat(CONFIG_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    if mtime != _DIR_MTIME:
+        with os.scandir(CONFIG_DIR) as entries:
+            _DIR_CACHE = {entry.name: entry.path for entry in entries if entry.is_file()}
+        _DIR_MTIME = mtime
+    return _DIR_CACHE
 
 
 class PromptConfig:
     """Manages prompt configurations for different content types"""
 
+    __slots__ = (
+        'config_path', 'data',
+        'name', 'description',
+        'image_strategy', 'image_prompt_mode', 'image_base_style', 'shot_count',
+        '_shot_templates', '_content_idea_prompt', '_story_writer_template',
+    )
+
     def __init__(self, config_path: str):
         """
         Load a prompt configuration from YAML file
@@ -21,6 +119,25 @@ class PromptConfig:
         self.data = self._load_config(config_path)
         self._validate_config()
 
+        # Settings read on hot paths are resolved once; the getters return these
+        image_gen = self.data['image_generation']
+        self.name = self.data.get('name', 'unknown')
+        self.description = self.data.get('description', '')
+        self.image_strategy = image_gen.get('strategy', 'flux-schnell')
+        self.image_prompt_mode = image_gen.get('mode', 'templated')
+        self.image_base_style = image_gen.get('base_style', 'photorealistic, high quality')
+        if self.image_prompt_mode == 'ai_generated':
+            # AI mode asks for an explicit count, otherwise one image per template
+            self.shot_count = image_gen.get('count', 10)
+        else:
+            self.shot_count = len(image_gen.get('shot_templates', []))
+
+        # Heavy sections are rendered/frozen on first access, so metadata-only
+        # callers (e.g. main.py's config summary) never pay for them
+        self._shot_templates = None
+        self._content_idea_prompt = None
+        self._story_writer_template = None
+
     @staticmethod
     def from_name(config_name: str) -> 'PromptConfig':
         """
@@ -32,14 +149,12 @@ class PromptConfig:
         Returns:
             PromptConfig instance
         """
-        # Try with .yaml extension first
-        config_path = os.path.join("prompt_configs", f"{config_name}.yaml")
+        entries = _config_dir_entries()
 
-        if not os.path.exists(config_path):
-            # Try without extension (in case user provided it)
-            config_path = os.path.join("prompt_configs", config_name)
+        # Try with .yaml extension first, then without (in case user provided it)
+        config_path = entries.get(f"{config_name}.yaml") or entries.get(config_name)
 
-        if not os.path.exists(config_path):
+        if config_path is None:
             raise FileNotFoundError(
                 f"Config file not found: {config_name}\n"
                 f"Looking in: prompt_configs/{config_name}.yaml"
@@ -47,18 +162,38 @@ class PromptConfig:
 
         return PromptConfig(config_path)
 
+    @staticmethod
+    def list_config_names() -> List[str]:
+        """Names of the configs available in prompt_configs/ (without .yaml)"""
+        return sorted(name[:-5] for name in _config_dir_entries() if name.endswith(".yaml"))
+
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load YAML configuration file"""
-        if not os.path.exists(config_path):
+        try:
+            st = os.stat(config_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
-        with open(config_path, 'r') as f:
-            data = yaml.safe_load(f)
+        key = os.path.abspath(config_path)
+        cached = _YAML_CACHE.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _YAML_CACHE.move_to_end(key)
+            # Callers may mutate their copy (e.g. strategy overrides)
+            return copy.deepcopy(cached[2])
+
+        with open(config_path, 'rb') as f:
+            raw = f.read()
+        data = _parse_yaml_cached(config_path, raw)
 
         if not data:
             raise ValueError(f"Empty or invalid YAML config: {config_path}")
 
-        return data
+        _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+        _YAML_CACHE.move_to_end(key)
+        while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+            _YAML_CACHE.popitem(last=False)
+
+        return copy.deepcopy(data)
 
     def _validate_config(self):
         """Validate that required fields are present"""
@@ -88,22 +223,29 @@ class PromptConfig:
     # === Content Idea Generation ===
 
     def get_content_idea_prompt(self) -> str:
-        """Generate the full prompt for content idea generation"""
+        """Generate the full prompt for content idea generation (rendered once, then reused)"""
+        if self._content_idea_prompt is None:
+            self._content_idea_prompt = self._render_content_idea_prompt()
+        return self._content_idea_prompt
+
+    def _render_content_idea_prompt(self) -> str:
+        """Assemble the content idea prompt from its config section"""
         section = self.data['content_idea']
 
-        prompt = f"# ROLE:\n{section['role']}\n\n"
-        prompt += f"# TASK:\n{section['task']}\n\n"
+        parts = [
+            f"# ROLE:\n{section['role']}\n\n",
+            f"# TASK:\n{section['task']}\n\n",
+        ]
 
         if 'output_characteristics' in section:
-            prompt += f"# OUTPUT CHARACTERISTICS:\n{section['output_characteristics']}\n\n"
+            parts.append(f"# OUTPUT CHARACTERISTICS:\n{section['output_characteristics']}\n\n")
 
         if 'examples' in section and section['examples']:
-            prompt += "# EXAMPLES:\n\n"
+            parts.append("# EXAMPLES:\n\n")
             for i, example in enumerate(section['examples'], 1):
-                prompt += f"## Example {i}:\n"
-                prompt += str(example) + "\n\n"
+                parts.append(f"## Example {i}:\n{example}\n\n")
 
-        return prompt
+        return "".join(parts)
 
     def get_content_idea_model(self) -> str:
         """Get the model to use for content idea generation"""
@@ -121,40 +263,49 @@ class PromptConfig:
 
     def get_story_writer_prompt(self, concept: str, duration: int = 60) -> str:
         """Generate the full prompt for story writing"""
+        if self._story_writer_template is None:
+            self._story_writer_template = self._render_story_writer_template()
+        return self._story_writer_template.format(concept=concept, duration=duration)
+
+    def _render_story_writer_template(self) -> str:
+        """Build the story writer prompt as a format string with {concept} and {duration} slots"""
         section = self.data['story_writer']
 
-        prompt = f"# ROLE:\n{section['role']}\n\n"
+        # Config text is escaped so braces in the YAML survive str.format
+        def literal(text):
+            return str(text).replace("{", "{{").replace("}", "}}")
 
-        prompt += f"# TASK:\n"
-        prompt += f"Write a {duration}-second video script based on the following concept: \"{concept}\".\n\n"
+        parts = [
+            literal(f"# ROLE:\n{section['role']}\n\n"),
+            "# TASK:\n",
+            "Write a {duration}-second video script based on the following concept: \"{concept}\".\n\n",
+        ]
 
         if 'structure' in section:
-            prompt += "Use this structure:\n"
+            parts.append("Use this structure:\n")
             if isinstance(section['structure'], list):
-                for item in section['structure']:
-                    prompt += f"- {item}\n"
+                parts.extend(literal(f"- {item}\n") for item in section['structure'])
             else:
-                prompt += section['structure']
-            prompt += "\n"
+                parts.append(literal(section['structure']))
+            parts.append("\n")
 
         if 'instructions' in section:
-            prompt += f"# INSTRUCTIONS:\n{section['instructions']}\n\n"
+            parts.append(literal(f"# INSTRUCTIONS:\n{section['instructions']}\n\n"))
 
         if 'output_characteristics' in section:
-            prompt += f"# OUTPUT CHARACTERISTICS:\n{section['output_characteristics']}\n\n"
+            parts.append(literal(f"# OUTPUT CHARACTERISTICS:\n{section['output_characteristics']}\n\n"))
 
         if 'tone' in section:
-            prompt += f"Tone: {section['tone']}\n"
+            parts.append(literal(f"Tone: {section['tone']}\n"))
 
         if 'max_words' in section:
-            prompt += f"Max words: {section['max_words']}\n"
+            parts.append(literal(f"Max words: {section['max_words']}\n"))
 
         if 'examples' in section and section['examples']:
-            prompt += "\n# EXAMPLES:\n"
-            for example in section['examples']:
-                prompt += f"{example}\n\n"
+            parts.append("\n# EXAMPLES:\n")
+            parts.extend(literal(f"{example}\n\n") for example in section['examples'])
 
-        return prompt
+        return "".join(parts)
 
     def get_story_writer_model(self) -> str:
         """Get the model to use for story writing"""
@@ -168,7 +319,7 @@ class PromptConfig:
 
     def get_image_strategy(self) -> str:
         """Get the image generation strategy (flux-schnell, flux-dev, pexels, etc.)"""
-        return self.data['image_generation'].get('strategy', 'flux-schnell')
+        return self.image_strategy
 
     def get_image_prompt_mode(self) -> str:
         """
@@ -177,11 +328,11 @@ class PromptConfig:
         Returns:
             'ai_generated' or 'templated' (default)
         """
-        return self.data['image_generation'].get('mode', 'templated')
+        return self.image_prompt_mode
 
     def get_image_base_style(self) -> str:
         """Get the base style applied to all image prompts"""
-        return self.data['image_generation'].get('base_style', 'photorealistic, high quality')
+        return self.image_base_style
 
     def get_ai_prompt_instructions(self) -> Optional[str]:
         """
@@ -192,22 +343,48 @@ class PromptConfig:
         """
         return self.data['image_generation'].get('ai_prompt_instructions', None)
 
-    def get_shot_templates(self) -> List[Dict[str, str]]:
+    def get_shot_templates(self) -> Tuple[Mapping[str, str], ...]:
         """
-        Get the list of shot templates for image generation (fallback for AI mode)
+        Get the shot templates for image generation (fallback for AI mode)
+
+        Templates are frozen into a tuple of read-only mappings on first
+        access, so every caller shares the same immutable sequence.
 
         Returns:
-            List of dicts with keys: name, description, template
+            Tuple of mappings with keys: name, description, template
+        """
+        if self._shot_templates is None:
+            # Intern the strings so every load of a config shares one copy,
+            # and cache keys built from them compare by identity first
+            self._shot_templates = tuple(
+                MappingProxyType({
+                    key: sys.intern(value) if isinstance(value, str) else value
+                    for key, value in template.items()
+                })
+                for template in self.data['image_generation'].get('shot_templates', [])
+            )
+        return self._shot_templates
+
+    def get_all_shot_prompts(self, subject: str) -> List[str]:
         """
-        return self.data['image_generation'].get('shot_templates', [])
+        Render every shot template for a subject in one call
+
+        Uses the same subject cleanup and pre-compiled templates as
+        AIPromptGenerator, so the prompts match the templated image path.
+
+        Args:
+            subject: Subject name (e.g., "2020 Toyota Supra (A90)")
+
+        Returns:
+            List of prompt strings, one per shot template
+        """
+        templates = self.get_shot_templates()
+        builder = PromptBuilder(templates, count=len(templates), base_style=self.get_image_base_style())
+        return [prompt_info["prompt"] for prompt_info in builder.build(subject)]
 
     def get_shot_count(self) -> int:
         """Get the number of shots/images to generate"""
-        # If mode is ai_generated, check for explicit count, otherwise use template count
-        if self.get_image_prompt_mode() == 'ai_generated':
-            return self.data['image_generation'].get('count', 10)
-        else:
-            return len(self.get_shot_templates())
+        return self.shot_count
 
     # === Distribution ===
 
@@ -227,11 +404,11 @@ class PromptConfig:
 
     def get_name(self) -> str:
         """Get the config name"""
-        return self.data.get('name', 'unknown')
+        return self.name
 
     def get_description(self) -> str:
         """Get the config description"""
-        return self.data.get('description', '')
+        return self.description
 
     def __str__(self) -> str:
         """String representation"""
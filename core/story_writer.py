@@ -1,17 +1,17 @@
-from openai import OpenAI
 from config import Config
+from core.openai_client import get_client
 
 class StoryWriter:
     """Writes video scripts from concepts using OpenAI"""
 
     def __init__(self, api_key=None, prompt_config=None):
-        self.api_key = api_key or Config.OPENAI_API_KEY
-        self.client = OpenAI(api_key=self.api_key)
-        self.prompt_config = prompt_config
-
         if not prompt_config:
             raise ValueError("StoryWriter requires a PromptConfig object. Legacy topic-based mode has been removed.")
 
+        self.api_key = api_key or Config.OPENAI_API_KEY
+        self.client = get_client(self.api_key)
+        self.prompt_config = prompt_config
+
     def write_script(self, concept, duration=60, prompt_config=None):
         """
         Write a video script based on a concept
@@ -1,17 +1,33 @@
 import os
-import shutil
+import re
 import random
-from openai import OpenAI
-from pydub import AudioSegment
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
+from core.openai_client import get_client
+
+TTS_MODEL = "tts-1"
+
+# Concurrent TTS requests per script (each sentence is an independent API call)
+TTS_MAX_WORKERS = 8
+
+# A sentence runs up to and including its ., ! or ? (or the end of the text)
+_SENTENCE_RE = re.compile(r'[^.!?]+[.!?]*')
+
+# OpenAI's "pcm" response format: raw 16-bit little-endian mono at 24 kHz
+PCM_SAMPLE_WIDTH = 2
+PCM_FRAME_RATE = 24000
+PCM_CHANNELS = 1
 
 class TextToSpeech:
     """Converts text to speech using OpenAI TTS"""
     
     def __init__(self, api_key=None, voice=None):
         self.api_key = api_key or Config.OPENAI_API_KEY
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = get_client(self.api_key)
         self.voice = voice or Config.DEFAULT_VOICE
+        self.combined_audio = None  # AudioSegment of the last generate_audio() call
     
     def generate_audio(self, text, output_dir=None):
         """
@@ -19,67 +35,155 @@ class TextToSpeech:
 
         Args:
             text: The text to convert to speech
-            output_dir: Directory to save audio files (default: Config.AUDIO_DIR)
+            output_dir: Unused; kept for compatibility (audio stays in memory, the cache lives in Config.TTS_CACHE_DIR)
 
         Returns:
-            tuple: (durations, sentences) where:
-                - durations: list of duration in seconds for each sentence
-                - sentences: list of sentence strings
+            tuple: (durations, sentences, spoken) where:
+                - durations: list of duration in seconds for each narrated sentence
+                - sentences: list of all sentence strings
+                - spoken: indices into sentences of the narrated ones (durations[k]
+                  belongs to sentences[spoken[k]]; failed sentences are skipped)
         """
-        if output_dir is None:
-            output_dir = Config.AUDIO_DIR
-        
-        # Clean up and recreate audio directory
-        if os.path.exists(output_dir):
-            shutil.rmtree(output_dir)
-        os.makedirs(output_dir, exist_ok=True)
-        
+        self.combined_audio = None
+
         # Split text into sentences
-        sentences = self._split_sentences(text)
+        sentences = self.split_sentences(text)
         print(f"Processing {len(sentences)} sentences...")
         
         # Select voice
         voice = self._select_voice()
         print(f"Using voice: {voice}")
         
-        # Generate audio for each sentence
+        # Generate audio for all sentences concurrently, keeping sentence order
         audio_segments = []
         durations = []
+        spoken = []
+
+        if sentences:
+            with ThreadPoolExecutor(max_workers=min(TTS_MAX_WORKERS, len(sentences))) as executor:
+                futures = [
+                    executor.submit(self._synthesize_sentence, sentence, voice)
+                    for sentence in sentences
+                ]
+
+                for i, future in enumerate(futures):
+                    try:
+                        audio = future.result()
+                    except Exception as e:
+                        print(f"Error generating audio for sentence {i}: {e}")
+                        continue
+
+                    durations.append(audio.duration_seconds)
+                    audio_segments.append(audio)
+                    spoken.append(i)
+
+            self._prune_cache()
         
-        for i, sentence in enumerate(sentences):
-            try:
-                response = self.client.audio.speech.create(
-                    model="tts-1",
-                    voice=voice,
-                    input=sentence
-                )
-                
-                # Save audio file
-                audio_path = os.path.join(output_dir, f"audio_{i}.mp3")
-                response.stream_to_file(audio_path)
-                
-                # Load and get duration
-                audio = AudioSegment.from_mp3(audio_path)
-                durations.append(audio.duration_seconds)
-                audio_segments.append(audio)
-                
-            except Exception as e:
-                print(f"Error generating audio for sentence {i}: {e}")
-                continue
-        
-        # Combine all audio segments
+        # Combine all audio segments in one pass (summing segments re-copies
+        # the growing buffer on every +); all share the TTS PCM format
         if audio_segments:
-            combined_audio = sum(audio_segments)
-            combined_path = os.path.join(Config.OUTPUT_DIR, "combined_output.wav")
-            combined_audio.export(combined_path, format="wav")
-            print(f"Combined audio saved to: {combined_path}")
+            from pydub import AudioSegment
+            first = audio_segments[0]
+            combined_audio = AudioSegment(
+                data=b"".join(segment.raw_data for segment in audio_segments),
+                sample_width=first.sample_width,
+                frame_rate=first.frame_rate,
+                channels=first.channels
+            )
+            self.combined_audio = combined_audio
+
+        return durations, sentences, spoken
+
+    def save_combined_audio(self, path=None):
+        """
+        Write the last generate_audio() narration to a WAV file (for callers that need it on disk)
+
+        Args:
+            path: Destination (default: combined_output.wav in Config.OUTPUT_DIR)
 
-        return durations, sentences
+        Returns:
+            str: Path to the written file
+        """
+        if self.combined_audio is None:
+            raise ValueError("No narration to save; call generate_audio() first")
+        path = path or os.path.join(Config.OUTPUT_DIR, "combined_output.wav")
+        self.combined_audio.export(path, format="wav")
+        return path
     
-    def _split_sentences(self, text):
+    def _synthesize_sentence(self, sentence, voice):
+        """Synthesize one sentence and return it as an AudioSegment"""
+        # Reruns of the same script reuse earlier synthesis instead of paying again
+        key = hashlib.blake2b(f"{voice}|{TTS_MODEL}|{sentence}".encode(), digest_size=16).hexdigest()
+        cache_path = os.path.join(Config.TTS_CACHE_DIR, f"{key}.pcm")
+
+        try:
+            with open(cache_path, "rb") as f:
+                pcm = f.read()
+            os.utime(cache_path)  # Mark as recently used for pruning
+        except OSError:
+            # Raw PCM needs no MP3 decode, temp file or ffmpeg subprocess
+            response = self.client.audio.speech.create(
+                model=TTS_MODEL,
+                voice=voice,
+                input=sentence,
+                response_format="pcm"
+            )
+            pcm = response.content
+            self._cache_put(cache_path, pcm)
+
+        from pydub import AudioSegment
+        return AudioSegment(
+            data=pcm,
+            sample_width=PCM_SAMPLE_WIDTH,
+            frame_rate=PCM_FRAME_RATE,
+            channels=PCM_CHANNELS
+        )
+
+    @staticmethod
+    def _cache_put(cache_path, pcm):
+        """Store synthesized PCM (write then rename, so readers never see a partial file)"""
+        try:
+            os.makedirs(Config.TTS_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=Config.TTS_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(pcm)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not cache TTS audio: {e}")
+
+    @staticmethod
+    def _prune_cache():
+        """Delete least recently used cached sentences once the cache exceeds TTS_CACHE_MAX_BYTES"""
+        try:
+            with os.scandir(Config.TTS_CACHE_DIR) as entries:
+                files = [
+                    (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                    for entry in entries if entry.name.endswith(".pcm")
+                ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in files)
+        if total <= Config.TTS_CACHE_MAX_BYTES:
+            return
+
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= Config.TTS_CACHE_MAX_BYTES:
+                break
+
+    def split_sentences(self, text):
         """Split text into sentences"""
-        # Clean and split by period
-        sentences = [s.strip() for s in text.replace("\n", " ").split(".") if s.strip()]
+        # One pass over the text; line breaks inside a sentence become spaces
+        sentences = [
+            " ".join(match.split())
+            for match in _SENTENCE_RE.findall(text)
+            if match.strip().rstrip(".!?")  # Skip stray punctuation
+        ]
         # Remove last sentence if it seems incomplete or very short
         if sentences and len(sentences[-1]) < 10:
             sentences = sentences[:-1]
@@ -87,10 +191,10 @@ class TextToSpeech:
     
     def _select_voice(self):
         """Select a voice for TTS"""
-        if self.voice == "random":
-            return random.choice(Config.AVAILABLE_VOICES)
-        elif self.voice in Config.AVAILABLE_VOICES:
+        if self.voice in Config.AVAILABLE_VOICES:
             return self.voice
-        else:
+
+        if self.voice != "random":
             print(f"Unknown voice '{self.voice}', using random")
-            return random.choice(Config.AVAILABLE_VOICES)
+
+        return random.choice(Config.AVAILABLE_VOICES)
@@ -1,78 +1,192 @@
 import os
-from moviepy.video.VideoClip import ImageClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
-from moviepy.video.compositing.CompositeVideoClip import CompositeVideoClip
+import shutil
+import subprocess
+import sys
+import tempfile
+from functools import lru_cache
 from config import Config
 
+SOFTWARE_CODEC = "libx264"
+# Stills at a low frame rate compress easily, so the slower presets buy little
+SOFTWARE_CODEC_ARGS = ("-preset", "veryfast", "-crf", "23")
+
+# Hardware H.264 encoders to try, in order of preference, per platform
+HARDWARE_CODECS = {
+    "darwin": ("h264_videotoolbox",),
+}
+DEFAULT_HARDWARE_CODECS = ("h264_nvenc", "h264_qsv")
+
+# Hardware encoders ignore CRF, so give them an explicit bitrate
+HARDWARE_BITRATE = "4M"
+
+
 class VideoComposer:
     """Composes video from images and audio"""
-    
+
     def __init__(self, fps=None):
         self.fps = fps or Config.VIDEO_FPS
-    
-    def create_video(self, image_paths, durations, output_name, audio_path=None):
+        self._codec = None  # Resolved from Config.VIDEO_CODEC on first encode
+
+    @property
+    def codec(self):
+        """H.264 encoder in use (probing ffmpeg's encoders the first time it's needed)"""
+        if self._codec is None:
+            self._codec = self._pick_codec(Config.VIDEO_CODEC)
+        return self._codec
+
+    @codec.setter
+    def codec(self, value):
+        self._codec = value
+
+    def create_video(self, image_paths, durations, output_name, audio):
         """
         Create a video from images and audio
-        
+
         Args:
             image_paths: List of paths to image files
             durations: List of durations (in seconds) for each image
             output_name: Name for the output video file
-            audio_path: Path to audio file (default: combined_output.wav in output dir)
-            
+            audio: Narration as an in-memory pydub AudioSegment
+
         Returns:
             str: Path to the created video file
+
+        Raises:
+            ValueError: If no narration is given (a silent video is never produced)
         """
-        if audio_path is None:
-            audio_path = os.path.join(Config.OUTPUT_DIR, "combined_output.wav")
-        
+        if audio is None:
+            raise ValueError("create_video requires the narration audio")
+
         # Ensure we have matching number of images and durations
         images = image_paths[:len(durations)]
-        
+
         if len(images) != len(durations):
             print(f"Warning: {len(images)} images but {len(durations)} durations")
             # Adjust to use the minimum
             min_len = min(len(images), len(durations))
             images = images[:min_len]
             durations = durations[:min_len]
-        
+
         print(f"Creating video with {len(images)} images...")
-        
-        # Create video clips from images
-        video_clips = []
-        for img_path, duration in zip(images, durations):
-            clip = ImageClip(img_path).with_duration(duration)
-            video_clips.append(clip)
-        
-        # Position clips sequentially
-        current_start = 0
-        positioned_clips = []
-        for clip, duration in zip(video_clips, durations):
-            positioned_clips.append(clip.with_start(current_start))
-            current_start += duration
-        
-        # Create composite video
-        video = CompositeVideoClip(positioned_clips)
-        
-        # Attach audio
-        if os.path.exists(audio_path):
-            audio = AudioFileClip(audio_path)
-            video = video.with_audio(audio)
-        else:
-            print(f"Warning: Audio file not found at {audio_path}")
-        
+
         # Generate output path
         output_path = os.path.join(Config.VIDEOS_DIR, f"{output_name}.mp4")
-        
-        # Write video file
-        print(f"Writing video to: {output_path}")
-        video.write_videofile(
-            output_path,
-            codec="libx264",
-            audio_codec="aac",
-            fps=self.fps,
-            ffmpeg_params=["-movflags", "+faststart"]
-        )
-        
+
+        # ffmpeg's concat demuxer holds each still for its duration, so every
+        # image is decoded once instead of being re-rendered per frame in Python
+        fd, list_path = tempfile.mkstemp(suffix=".txt", prefix="concat_", dir=Config.OUTPUT_DIR)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self._concat_list(images, durations))
+
+            command = [
+                _ffmpeg_binary(), "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path
+            ]
+
+            # Attach audio: raw samples go straight to ffmpeg's stdin, no WAV on disk
+            pcm = audio.raw_data
+            command += self._pcm_input_args(audio) + ["-c:a", "aac", "-shortest"]
+
+            # Write video file
+            print(f"Writing video to: {output_path} ({self.codec})")
+            result = subprocess.run(self._video_args(command, output_path), input=pcm, capture_output=True)
+
+            if result.returncode != 0 and self.codec != SOFTWARE_CODEC:
+                # Encoder is compiled in but the device isn't usable; stay on software from now on
+                print(f"⚠️  {self.codec} failed, falling back to {SOFTWARE_CODEC}")
+                self.codec = SOFTWARE_CODEC
+                result = subprocess.run(self._video_args(command, output_path), input=pcm, capture_output=True)
+
+            if result.returncode != 0:
+                stderr = result.stderr.decode(errors="replace").strip()
+                raise RuntimeError(f"ffmpeg failed: {stderr[-500:]}")
+        finally:
+            os.unlink(list_path)
+
         print(f"✓ Video created: {output_path}")
         return output_path
+
+    @staticmethod
+    def _pcm_input_args(audio):
+        """ffmpeg input options for an AudioSegment's raw samples piped on stdin"""
+        sample_formats = {1: "u8", 2: "s16le", 4: "s32le"}
+        return [
+            "-f", sample_formats[audio.sample_width],
+            "-ar", str(audio.frame_rate),
+            "-ac", str(audio.channels),
+            "-i", "pipe:0"
+        ]
+
+    def _video_args(self, command, output_path):
+        """Append the video encoding options and output path to an ffmpeg command"""
+        video_args = ["-c:v", self.codec]
+        if self.codec == SOFTWARE_CODEC:
+            video_args += SOFTWARE_CODEC_ARGS
+        else:
+            video_args += ["-b:v", HARDWARE_BITRATE]
+        return command + video_args + [
+            "-pix_fmt", "yuv420p",
+            "-r", str(self.fps),
+            "-movflags", "+faststart",
+            output_path
+        ]
+
+    @staticmethod
+    def _pick_codec(requested):
+        """Resolve Config.VIDEO_CODEC; "auto" picks the first hardware encoder ffmpeg offers"""
+        if requested != "auto":
+            return requested
+
+        available = _ffmpeg_encoders(_ffmpeg_binary())
+        for codec in HARDWARE_CODECS.get(sys.platform, DEFAULT_HARDWARE_CODECS):
+            if codec in available:
+                return codec
+        return SOFTWARE_CODEC
+
+    @staticmethod
+    def _concat_list(images, durations):
+        """Build an ffmpeg concat demuxer script showing each image for its duration"""
+        def file_line(path):
+            # Quote for the concat script: ' becomes '\''
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            return f"file '{escaped}'\n"
+
+        lines = []
+        for img_path, duration in zip(images, durations):
+            lines.append(file_line(img_path))
+            lines.append(f"duration {duration:.6f}\n")
+
+        # The demuxer ignores the last entry's duration unless the file is repeated
+        if images:
+            lines.append(file_line(images[-1]))
+        return "".join(lines)
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_binary():
+    """ffmpeg executable: the one on PATH, else imageio-ffmpeg's bundled build (looked up once)"""
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+
+    import imageio_ffmpeg
+    return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_encoders(ffmpeg_binary):
+    """Names of the encoders an ffmpeg binary was built with (probed once)"""
+    try:
+        result = subprocess.run(
+            [ffmpeg_binary, "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return frozenset()
+
+    # Encoder lines look like " V....D libx264   libx264 H.264 ..."
+    return frozenset(
+        parts[1] for parts in (line.split() for line in result.stdout.splitlines())
+        if len(parts) > 1 and len(parts[0]) == 6
+    )
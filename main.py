@@ -5,6 +5,7 @@ PosterBot - Automated Video Content Creation and Distribution
 Usage:
     python main.py --config cars                # Create 1 car video and email it
     python main.py --config cars --count 5      # Create 5 car videos
+    python main.py --config cars --count 4 --parallel 2  # Create 4 videos, 2 at a time
     python main.py --config alien_stories       # Create alien encounter video
     python main.py --distribute-to tiktok       # Post to TikTok
     python main.py --no-distribute              # Create video but don't distribute
@@ -12,7 +13,6 @@ Usage:
 
 import argparse
 import sys
-from core.pipeline import Pipeline
 from core.prompt_config import PromptConfig
 
 def main():
@@ -35,6 +35,14 @@ def main():
         help="Number of videos to create (default: 1)"
     )
 
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        help="Number of videos to create at once in separate processes "
+             "(default: 1; 0 = automatic, up to 4; ignored for FLUX)"
+    )
+
     parser.add_argument(
         "--distribute-to",
         type=str,
@@ -64,27 +72,29 @@ def main():
     except FileNotFoundError as e:
         print(f"✗ Error: {e}")
         print("\nAvailable configs in prompt_configs/:")
-        import os
-        if os.path.exists("prompt_configs"):
-            for f in os.listdir("prompt_configs"):
-                if f.endswith(".yaml"):
-                    print(f"  - {f.replace('.yaml', '')}")
+        for name in PromptConfig.list_config_names():
+            print(f"  - {name}")
         sys.exit(1)
     except Exception as e:
         print(f"✗ Error loading config: {e}")
         sys.exit(1)
 
+    # Imported only once a config is resolved, so --help and bad --config
+    # exits don't load every pipeline stage
+    from core.pipeline import Pipeline
+
     # Create and run pipeline
     print("\n" + "="*60)
     print("POSTERBOT - Video Content Creator")
     print("="*60 + "\n")
 
-    pipeline = Pipeline(prompt_config=prompt_config)
-    videos = pipeline.run(
-        iterations=args.count,
-        distribute_to=distribute_to,
-        prompt_config=prompt_config
-    )
+    with Pipeline(prompt_config=prompt_config) as pipeline:
+        videos = pipeline.run(
+            iterations=args.count,
+            distribute_to=distribute_to,
+            prompt_config=prompt_config,
+            parallel_iterations=args.parallel
+        )
 
     print(f"\n✓ Created {len(videos)} video(s)")
     for i, video in enumerate(videos, 1):
@@ -10,12 +10,15 @@ import os
 # Add the project root to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.media_collector import MediaCollector
-from core.ai_prompt_generator import AIPromptGenerator
 from config import Config
 
+# Project modules are imported inside the test that needs them, so the
+# script starts (and each test fails) without loading the other stages
+
 def test_prompt_generator():
     """Test the AI prompt generator"""
+    from core.ai_prompt_generator import AIPromptGenerator
+
     print("=" * 60)
     print("Testing AI Prompt Generator")
     print("=" * 60)
@@ -34,6 +37,8 @@ def test_prompt_generator():
 
 def test_flux_generation():
     """Test FLUX image generation"""
+    from core.media_collector import MediaCollector
+
     print("=" * 60)
     print("Testing FLUX Image Generation")
     print("=" * 60)
@@ -54,8 +59,8 @@ def test_flux_generation():
     print("Generating 2 test images (this may take 30-60 seconds)...\n")
 
     try:
-        collector = MediaCollector(image_source="flux-schnell")
-        image_paths = collector.collect_media(test_car, count=2)
+        with MediaCollector(image_source="flux-schnell") as collector:
+            image_paths = collector.collect_media(test_car, count=2)
 
         print("\n" + "=" * 60)
         print("✓ SUCCESS! FLUX is working correctly")
@@ -5,25 +5,34 @@ Handles the OAuth flow to get access and refresh tokens for TikTok API
 """
 
 import os
+import time
+import threading
 import webbrowser
 import requests
 from urllib.parse import urlencode
-from dotenv import load_dotenv, set_key
-
-# Load environment variables
-load_dotenv()
+try:
+    # orjson parses straight from the response bytes; fall back to the stdlib if it isn't installed
+    from orjson import JSONDecodeError, loads as json_loads
+except ImportError:
+    from json import JSONDecodeError, loads as json_loads
+from config import Config, set_env_keys
+from core.http_session import create_session
 
 # TikTok API endpoints
 AUTH_URL = "https://www.tiktok.com/v2/auth/authorize/"
 TOKEN_URL = "https://open.tiktokapis.com/v2/oauth/token/"
 
-# Configuration from .env
-CLIENT_KEY = os.getenv("TIKTOK_CLIENT_KEY")
-CLIENT_SECRET = os.getenv("TIKTOK_CLIENT_SECRET")
+# Configuration from .env (parsed once by config.py)
+CLIENT_KEY = Config.TIKTOK_CLIENT_KEY
+CLIENT_SECRET = Config.TIKTOK_CLIENT_SECRET
+# Read directly: Config falls back to a localhost URI, but auth must use the registered one
 REDIRECT_URI = os.getenv("TIKTOK_REDIRECT_URI")
 
-def generate_auth_url():
-    """Generate the TikTok authorization URL"""
+# Keep-alive session for TikTok's OAuth endpoints
+_session = create_session()
+
+def _build_auth_url():
+    """Build the TikTok authorization URL from the configured client"""
     params = {
         "client_key": CLIENT_KEY,
         "scope": "user.info.basic,video.publish",
@@ -31,9 +40,15 @@ def generate_auth_url():
         "redirect_uri": REDIRECT_URI,
         "state": "posterbot_auth"  # Optional state parameter for security
     }
+    return f"{AUTH_URL}?{urlencode(params)}"
 
-    auth_url = f"{AUTH_URL}?{urlencode(params)}"
-    return auth_url
+# Every parameter is fixed for the process, so encode the URL once
+# (left for generate_auth_url() when the client isn't configured yet)
+_AUTH_URL_CACHED = _build_auth_url() if CLIENT_KEY and REDIRECT_URI else None
+
+def generate_auth_url():
+    """Generate the TikTok authorization URL"""
+    return _AUTH_URL_CACHED or _build_auth_url()
 
 def exchange_code_for_tokens(auth_code):
     """Exchange authorization code for access and refresh tokens"""
@@ -52,45 +67,65 @@ def exchange_code_for_tokens(auth_code):
     }
 
     try:
-        response = requests.post(TOKEN_URL, data=data, headers=headers)
+        response = _session.post(TOKEN_URL, data=data, headers=headers)
         response.raise_for_status()
-
-        result = response.json()
-
-        # TikTok returns tokens directly in the response, not wrapped in "data"
-        if "access_token" in result:
-            return result
-        elif "data" in result:
-            return result["data"]
-        elif "error" in result:
-            print(f"❌ Error from TikTok: {result['error']}")
-            if "error_description" in result:
-                print(f"   Description: {result['error_description']}")
-            return None
-        else:
-            print(f"❌ Unexpected response format: {result}")
-            return None
-
     except requests.exceptions.RequestException as e:
         print(f"❌ Request failed: {e}")
         if hasattr(e, 'response') and e.response is not None:
             print(f"   Response: {e.response.text}")
         return None
 
+    try:
+        result = json_loads(response.content)
+    except JSONDecodeError as e:
+        print(f"❌ Invalid token response: {e}")
+        return None
+
+    # TikTok returns tokens directly in the response, not wrapped in "data"
+    if "access_token" in result:
+        return result
+    elif "data" in result:
+        return result["data"]
+    elif "error" in result:
+        print(f"❌ Error from TikTok: {result['error']}")
+        if "error_description" in result:
+            print(f"   Description: {result['error_description']}")
+        return None
+    else:
+        print(f"❌ Unexpected response format: {result}")
+        return None
+
 def save_tokens_to_env(access_token, refresh_token, expires_in):
-    """Save tokens to .env file"""
+    """Save tokens (and when the access token expires) to .env file"""
     env_file = ".env"
 
+    # 0 = unknown expiry: PosterBot then skips the proactive refresh and relies on refresh-on-401
+    expires_at = int(time.time() + expires_in) if expires_in else 0
+
     try:
-        set_key(env_file, "TIKTOK_ACCESS_TOKEN", access_token)
-        set_key(env_file, "TIKTOK_REFRESH_TOKEN", refresh_token)
+        # One atomic write, with the expiry so PosterBot can refresh before it lapses
+        set_env_keys({
+            "TIKTOK_ACCESS_TOKEN": access_token,
+            "TIKTOK_REFRESH_TOKEN": refresh_token,
+            "TIKTOK_ACCESS_TOKEN_EXPIRES_AT": str(expires_at),
+        }, path=env_file)
         print(f"✅ Tokens saved to {env_file}")
-        print(f"   Access token expires in {expires_in} seconds ({expires_in // 3600} hours)")
+        if expires_in:
+            print(f"   Access token expires in {expires_in} seconds ({expires_in // 3600} hours)")
+        else:
+            print("   Access token expiry not reported; it will be refreshed when TikTok rejects it")
         return True
     except Exception as e:
         print(f"❌ Failed to save tokens: {e}")
         return False
 
+def _open_browser(url):
+    """Open url in the default browser, reporting (not raising) failures"""
+    try:
+        webbrowser.open(url)
+    except Exception as e:
+        print(f"⚠️  Could not open browser automatically: {e}")
+
 def main():
     """Main OAuth flow"""
     print("=" * 60)
@@ -121,11 +156,9 @@ def main():
     print(auth_url)
     print()
 
-    # Open browser
-    try:
-        webbrowser.open(auth_url)
-    except Exception as e:
-        print(f"⚠️  Could not open browser automatically: {e}")
+    # Open browser in the background; launching it can take a moment and
+    # the URL is already printed above
+    threading.Thread(target=_open_browser, args=(auth_url,), daemon=True).start()
 
     print("Step 2: Authorize and Get Code")
     print("-" * 60)